@@ -0,0 +1,116 @@
+"""Analytics chart refreshes: memory growth and time per refresh.
+
+"rebuild" is what WalletGUI.update_charts did before: a new plt.subplots
+figure per refresh that pyplot keeps alive because it is never closed.
+"reuse" drives wallet-2.py's ExpenseCharts on one long-lived figure. Both
+render with the Agg canvas, so no display is needed; the wallet is a
+temporary JSON ledger that gets one transaction per refresh.
+
+Run from the repository root:  python benchmarks/bench_charts.py [refreshes]
+"""
+import gc
+import importlib.util
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import warnings
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "wallet"))
+
+import ledger  # noqa: E402
+
+spec = importlib.util.spec_from_file_location("wallet_gui", os.path.join(ROOT, "wallet", "wallet-2.py"))
+wallet_gui = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(wallet_gui)
+
+CATEGORIES = ["Food", "Transport", "Bills", "Shopping", "Entertainment", "Other"]
+
+
+def mutate(wallet, rng):
+    if rng.random() < 0.3 or wallet.balance < 100:
+        wallet.add_transaction(f"{rng.randint(100, 999)}.00", "income", "Salary", "pay")
+    else:
+        wallet.add_transaction(f"{rng.randint(1, 99)}.{rng.randint(0, 99):02d}", "expense", rng.choice(CATEGORIES), "x")
+
+
+def rebuild(wallet):
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+    expense_data = wallet.get_expense_by_category()
+    if expense_data:
+        ax1.pie(expense_data.values(), labels=expense_data.keys(), autopct='%1.1f%%', startangle=90)
+    monthly_data = wallet.get_monthly_data(6)
+    months = list(monthly_data)
+    ax2.bar(range(len(months)), [monthly_data[m]['income'] for m in months], 0.35)
+    ax2.bar([i + 0.35 for i in range(len(months))], [monthly_data[m]['expense'] for m in months], 0.35)
+    plt.tight_layout()
+    fig.canvas.draw()
+
+
+def make_reuse():
+    figure = Figure(figsize=(12, 5))
+    charts = wallet_gui.ExpenseCharts(figure)
+    canvas = FigureCanvasAgg(figure)
+
+    def reuse(wallet):
+        charts.update(wallet.get_expense_by_category(), wallet.get_monthly_data(6))
+        canvas.draw_idle()
+    return reuse
+
+
+def rss_mb():
+    """Current resident set size; peak RSS where /proc is not available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def run(label, refresh, n, tmp):
+    rng = random.Random(0)
+    wallet = ledger.PersonalWallet(os.path.join(tmp, f"{label}.json"))
+    # Warm up caches (fonts, text layout) before measuring
+    for _ in range(20):
+        mutate(wallet, rng)
+        refresh(wallet)
+    gc.collect()
+    base = rss_mb()
+    start = time.perf_counter()
+    step = max(n // 5, 1)
+    samples = []
+    for i in range(1, n + 1):
+        mutate(wallet, rng)
+        refresh(wallet)
+        if i % step == 0:
+            gc.collect()
+            samples.append(rss_mb() - base)
+    elapsed = time.perf_counter() - start
+    wallet.close()
+    growth = "  ".join(f"{mb:6.1f}" for mb in samples)
+    print(f"{label:8} {n:>6,} refreshes  {elapsed / n * 1000:6.1f} ms each"
+          f"  RSS growth (MB) every {step}: {growth}")
+
+
+def main(n):
+    warnings.simplefilter("ignore")  # pyplot's "more than 20 figures" warning
+    with tempfile.TemporaryDirectory() as tmp:
+        run("rebuild", rebuild, min(n, 200), tmp)  # about 3.6 MB per refresh
+        plt.close("all")
+        run("reuse", make_reuse(), n, tmp)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
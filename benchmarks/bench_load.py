@@ -0,0 +1,101 @@
+"""Startup load: json.load of the whole file vs. the streaming loaders.
+
+Generates tasks.json and a wallet snapshot in a temp directory and reports
+time-to-first-screen and total load time for each size.
+
+Run from the repository root:  python benchmarks/bench_load.py [sizes...]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from itertools import islice
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "wallet"))
+
+import ledger  # noqa: E402
+from task_store import LOAD_FIRST_BATCH, Task, iter_task_file  # noqa: E402
+
+WORDS = "buy milk call mom finish report book flight pay rent water plants review".split()
+CATEGORIES = ["Food", "Transport", "Bills", "Shopping", "Salary", "Other"]
+
+
+def write_tasks(path, n, seed=0):
+    rng = random.Random(seed)
+    tasks = [Task(" ".join(rng.choices(WORDS, k=5)), done=rng.random() < 0.3).to_dict() for _ in range(n)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(tasks, f, ensure_ascii=False, indent=2)
+
+
+def write_wallet(path, n, seed=0):
+    rng = random.Random(seed)
+    transactions = [{
+        "id": i + 1,
+        "amount_cents": rng.randint(100, 50_000),
+        "type": "Income" if rng.random() < 0.2 else "Expense",
+        "category": rng.choice(CATEGORIES),
+        "description": " ".join(rng.choices(WORDS, k=3)),
+        "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 12:00:00",
+    } for i in range(n)]
+    with open(path, "w") as f:
+        json.dump({"transactions": transactions, "balance": "0.00", "budget": "0.00", "next_id": n + 1}, f, indent=2)
+
+
+def eager_tasks(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [Task.from_dict(d) for d in json.load(f)]
+
+
+def streaming_tasks(path):
+    start = time.perf_counter()
+    tasks = iter_task_file(path)
+    loaded = list(islice(tasks, LOAD_FIRST_BATCH))
+    first = time.perf_counter() - start
+    loaded.extend(tasks)
+    return first, time.perf_counter() - start, len(loaded)
+
+
+def eager_wallet(path):
+    # What JsonStorage.load did before streaming: parse everything, then index
+    with open(path) as f:
+        data = json.load(f)
+    storage = ledger.JsonStorage(path, journal=False)
+    for t in data["transactions"]:
+        storage.index_transaction(ledger.migrate_transaction(t))
+    storage.date_index = ledger.DateIndex(storage.by_id.values())
+    return storage
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(sizes):
+    with tempfile.TemporaryDirectory() as tmp:
+        tasks_file = os.path.join(tmp, "tasks.json")
+        wallet_file = os.path.join(tmp, "wallet.json")
+        for n in sizes:
+            write_tasks(tasks_file, n)
+            write_wallet(wallet_file, n)
+            size_mb = os.path.getsize(tasks_file) / 1e6
+            t_eager = timed(lambda: eager_tasks(tasks_file))
+            first, total, count = streaming_tasks(tasks_file)
+            assert count == n
+            print(f"n={n:>9,}  tasks.json {size_mb:7.1f} MB  json.load {t_eager:7.2f}s"
+                  f"  streaming first screen {first * 1000:7.1f} ms, all {total:7.2f}s")
+
+            size_mb = os.path.getsize(wallet_file) / 1e6
+            t_eager = timed(lambda: eager_wallet(wallet_file))
+            t_stream = timed(lambda: ledger.JsonStorage(wallet_file, journal=False).load())
+            print(f"{'':12} wallet    {size_mb:7.1f} MB  json.load {t_eager:7.2f}s"
+                  f"  streaming load {t_stream:7.2f}s")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,69 @@
+"""Task text search: linear scan vs. TrigramIndex, and the cost of building the index.
+
+Run from the repository root:  python benchmarks/bench_search.py [sizes...]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_store import TEXT_INDEX_BATCH, Task, TrigramIndex  # noqa: E402
+
+WORDS = ("buy milk call mom finish report book flight pay rent water plants review pull request "
+         "clean kitchen renew passport walk dog fix bike schedule dentist update resume").split()
+QUERIES = ["report", "pass", "dentist", "milk call", "zzz", "re"]
+
+
+def make_tasks(n, seed=0):
+    rng = random.Random(seed)
+    return [Task(" ".join(rng.choices(WORDS, k=5)) + f" #{i}", id=i) for i in range(n)]
+
+
+def scan(tasks, query):
+    return [t for t in tasks if query in t.text.lower()]
+
+
+def best_of(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes):
+    for n in sizes:
+        tasks = make_tasks(n)
+        start = time.perf_counter()
+        index = TrigramIndex()
+        index.rebuild(tasks)
+        build = time.perf_counter() - start
+        # What the app does instead: queue every task, then index a slice per Tk tick
+        queued = TrigramIndex()
+        for t in tasks:
+            queued.add(t)
+        slices = []
+        while not queued.ready:
+            start = time.perf_counter()
+            queued.catch_up(TEXT_INDEX_BATCH)
+            slices.append(time.perf_counter() - start)
+        print(f"n={n:>9,}  index build {build:8.3f}s  (in slices of {TEXT_INDEX_BATCH:,}:"
+              f" median {statistics.median(slices) * 1000:5.1f} ms, slowest {max(slices) * 1000:6.1f} ms)")
+        for query in QUERIES:
+            expected = scan(tasks, query)
+            hits = index.search(query)
+            if hits is None:
+                hits = expected  # the app falls back to scanning
+            assert hits == expected, query
+            t_scan = best_of(lambda: scan(tasks, query))
+            t_index = best_of(lambda: index.search(query) is not None or scan(tasks, query))
+            print(f"    {query!r:12} hits={len(hits):>8,}  scan {t_scan * 1000:9.2f} ms"
+                  f"  index {t_index * 1000:9.2f} ms  x{t_scan / t_index if t_index else float('inf'):6.1f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,85 @@
+"""Wallet GUI startup: eager vs. lazy matplotlib import.
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+"eager" imports matplotlib.pyplot and the TkAgg backend before loading
+wallet-2.py, which is what the module did at import time before charts were
+deferred to the first view of the Analytics tab; "lazy" loads wallet-2.py as
+it is now. When a display is available the WalletGUI window is also built
+(and its first idle pass run) inside the timing.
+
+Run from the repository root:  python benchmarks/bench_startup.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WALLET_DIR = os.path.join(ROOT, "wallet")
+
+CHILD = r"""
+import importlib.util, os, sys, time
+start = time.perf_counter()
+if {eager}:
+    import matplotlib.pyplot
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+sys.path.insert(0, {wallet_dir!r})
+spec = importlib.util.spec_from_file_location("wallet_gui", os.path.join({wallet_dir!r}, "wallet-2.py"))
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+imported = time.perf_counter() - start
+shown = None
+if {gui}:
+    root = module.tk.Tk()
+    module.WalletGUI(root)
+    root.update()
+    shown = time.perf_counter() - start
+    root.destroy()
+print(imported, shown, "matplotlib" in sys.modules)
+"""
+
+
+def has_display():
+    if not (os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin")):
+        return False
+    try:
+        import tkinter
+        tkinter.Tk().destroy()
+        return True
+    except Exception:
+        return False
+
+
+def run(eager, gui, cwd):
+    code = CHILD.format(eager=eager, gui=gui, wallet_dir=WALLET_DIR)
+    out = subprocess.run([sys.executable, "-c", code], cwd=cwd, check=True,
+                         capture_output=True, text=True).stdout.split()
+    shown = None if out[1] == "None" else float(out[1])
+    return float(out[0]), shown, out[2] == "True"
+
+
+def main(runs):
+    try:
+        import matplotlib  # noqa: F401
+    except ImportError:
+        print("matplotlib is not installed; both variants would measure the same thing")
+        return
+    gui = has_display()
+    if not gui:
+        print("no display: measuring module import only")
+    # The wallet files are created in the working directory, so use a clean one
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, eager in (("eager", True), ("lazy", False)):
+            results = [run(eager, gui, tmp) for _ in range(runs)]
+            imported = statistics.median(r[0] for r in results)
+            line = f"{label:6} import {imported * 1000:7.1f} ms"
+            if gui:
+                shown = statistics.median(r[1] for r in results)
+                line += f"  window shown {shown * 1000:7.1f} ms"
+            line += f"  matplotlib loaded: {results[0][2]}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,64 @@
+"""Headless TaskStore hot paths: bulk add, toggle, filter, search, delete and flush.
+
+Runs without a display (nothing here imports tkinter), against temp files.
+
+Run from the repository root:  python benchmarks/bench_store.py [sizes...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_store import CATEGORIES, PRIORITIES, TaskStore  # noqa: E402
+
+WORDS = "buy milk call mom finish report book flight pay rent water plants review".split()
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"    {label:28} {(time.perf_counter() - start) * 1000:10.1f} ms")
+    return result
+
+
+def run(backend, n, tmp, seed=0):
+    rng = random.Random(seed)
+    # The ticket numbers give text searches a selective needle: every word in WORDS is in
+    # far more than TrigramIndex.SCAN_RATIO of the tasks, so searching for one always scans
+    texts = [" ".join(rng.choices(WORDS, k=4)) + f" #{i}" for i in range(n)]
+    needle = f"#{n // 2}"
+    store = TaskStore(backend, os.path.join(tmp, f"{backend}.json"), os.path.join(tmp, f"{backend}.db"))
+    print(f"{backend} n={n:,}")
+    timed("add", lambda: [store.add(t, rng.choice(CATEGORIES), rng.choice(PRIORITIES)) for t in texts])
+    timed("flush (adds)", lambda: (store.flush(), store.writer.wait()))
+    sample = rng.sample(store.tasks, n // 10)
+    timed("set_done 10%", lambda: store.set_done(sample, True))
+    timed("query done+category", lambda: store.query(done=True, category="Work"))
+    timed("query text (unindexed scan)", lambda: store.query(needle))
+    # The GUI builds the trigram index a slice per idle callback; do all of it here
+    timed("index text (all slices)", lambda: [None for _ in iter(store.index_text, True)])
+    assert store.text_index.search(needle) is not None
+    timed("query text (indexed)", lambda: store.query(needle))
+    timed("query common word (scan)", lambda: store.query("flight"))
+    timed("stats", store.stats)
+    timed("delete 10%", lambda: store.delete(t.id for t in rng.sample(store.tasks, n // 10)))
+    timed("flush (changes)", lambda: (store.flush(), store.writer.wait()))
+    store.close()
+    reloaded = TaskStore(backend, os.path.join(tmp, f"{backend}.json"), os.path.join(tmp, f"{backend}.db"))
+    timed("load", reloaded.load)
+    assert len(reloaded) == n - n // 10
+    reloaded.close()
+
+
+def main(sizes):
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            for backend in ("json", "sqlite"):
+                run(backend, n, tmp)
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,186 @@
+"""File I/O shared by the task manager (task_store.py) and the wallet (wallet/ledger.py).
+
+A streaming JSON reader for large documents, atomic whole-file writes, and a
+worker thread that does those writes off the GUI thread. No GUI imports.
+"""
+import json
+import os
+import queue
+import re
+import threading
+
+# Characters that can continue a JSON number
+NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+
+# -----------------------------
+# Streaming JSON reader
+# -----------------------------
+class JsonStreamReader:
+    """Incremental reader for a JSON document whose containers hold objects.
+
+    Only a chunk of the file is buffered at a time; values are decoded one by one
+    with raw_decode, so a top-level array can be consumed element by element."""
+
+    def __init__(self, f, chunk_size: int = 1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Append the next chunk to the buffer; False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character (without consuming it), or "" at EOF."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, ch: str):
+        """Consume the structural character ch."""
+        if self.peek() != ch:
+            raise ValueError(f"Malformed JSON: expected {ch!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Value continues past the buffered chunk
+                if not self.fill():
+                    raise
+                continue
+            # A number cut off by the end of the chunk still decodes ("12" of
+            # "123", "1" of "1.5"), so one that runs up to the end of the buffer
+            # is decoded again once more of the file is in
+            if (isinstance(value, (int, float))
+                    and NUMBER_TAIL.match(self.buf, end).end() == len(self.buf) and self.fill()):
+                continue
+            self.pos = end
+            return value
+
+    def iter_array(self):
+        """Yield the elements of the array at the current position one by one."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+    def iter_keys(self):
+        """Yield the keys of the object at the current position; the caller reads each value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+
+# -----------------------------
+# Background file I/O
+# -----------------------------
+def write_atomic(path: str, write, newline=None):
+    """Write via a temp file and rename, so a crash never leaves a half-written file."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline=newline, encoding="utf-8") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class BackgroundWriter:
+    """Writes files atomically on a worker thread.
+
+    submit() takes a snapshot already copied by the caller; a newer write to a path
+    that is still queued replaces the older one. Completion callbacks are queued and run
+    on the caller's (e.g. the Tk) thread by poll()."""
+
+    def __init__(self, name: str = "writer"):
+        self.name = name
+        self.lock = threading.Lock()
+        self.pending = {}              # path -> (write, newline, on_done, on_error), not started yet
+        self.outstanding = 0           # queued or running jobs
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.thread = None
+
+    def submit(self, path: str, write, on_done=None, on_error=None, newline=None):
+        """Queue write(f) for path; on_done() or on_error(exc) runs on the next poll()."""
+        with self.lock:
+            queued = path in self.pending
+            self.pending[path] = (write, newline, on_done, on_error)
+            if not queued:
+                self.outstanding += 1
+        if not queued:
+            self.jobs.put(path)
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while True:
+            path = self.jobs.get()
+            with self.lock:
+                write, newline, on_done, on_error = self.pending.pop(path)
+            try:
+                write_atomic(path, write, newline)
+            except Exception as e:
+                self.results.put((on_error, (e,)))
+            else:
+                self.results.put((on_done, ()))
+            with self.lock:
+                self.outstanding -= 1
+            self.jobs.task_done()
+
+    def busy(self) -> bool:
+        """Whether writes are in flight or callbacks are waiting for poll()."""
+        return self.outstanding > 0 or not self.results.empty()
+
+    def poll(self):
+        """Run finished jobs' callbacks on the calling thread."""
+        while True:
+            try:
+                callback, args = self.results.get_nowait()
+            except queue.Empty:
+                return
+            if callback is not None:
+                callback(*args)
+
+    def wait(self):
+        """Block until every queued write is on disk, then run the callbacks."""
+        self.jobs.join()
+        self.poll()
@@ -0,0 +1,831 @@
+"""Headless task engine behind the Advanced Task Manager (test.py).
+
+Tasks, their indexes and counters, and reading/writing them from tasks.db or
+tasks.json. Nothing here imports tkinter: errors are raised to the caller, so the
+engine can be driven in bulk and profiled without a display.
+"""
+from datetime import datetime
+from collections import Counter, OrderedDict
+from itertools import islice
+from operator import attrgetter
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+from fileio import BackgroundWriter, JsonStreamReader
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# -----------------------------
+# Storage config
+# -----------------------------
+DATA_FILE = "tasks.json"
+DB_FILE = "tasks.db"
+STORAGE_BACKEND = "sqlite"   # sqlite | json
+
+# Streaming load: a loader thread parses batches; the first one is small so the
+# first screenful can be shown right away
+LOAD_FIRST_BATCH = 200
+LOAD_BATCH = 20000
+
+# Tasks added to the trigram index per TaskStore.index_text() call; about 20 ms
+TEXT_INDEX_BATCH = 1000
+
+CATEGORIES = ["General", "Home", "Work", "Study", "Shopping"]
+PRIORITIES = ["Low", "Medium", "High", "Urgent"]
+
+CREATED_FORMAT = "%Y-%m-%d %H:%M"
+
+
+# -----------------------------
+# Compact task record
+# -----------------------------
+# Category/priority names are stored once here; tasks only hold a small int code.
+# Unknown names found in old files are appended so they still round-trip.
+CATEGORY_NAMES = [sys.intern(c) for c in CATEGORIES]
+PRIORITY_NAMES = [sys.intern(p) for p in PRIORITIES]
+NAMES_LOCK = threading.Lock()   # the loader thread can add names too
+
+
+def name_code(names: list, name: str) -> int:
+    try:
+        return names.index(name)
+    except ValueError:
+        with NAMES_LOCK:
+            if name not in names:
+                names.append(sys.intern(name))
+            return names.index(name)
+
+
+def parse_task_id(value) -> int:
+    """128-bit int from a uuid string; other legacy ids hash to a stable uuid5."""
+    if isinstance(value, int):
+        return value
+    try:
+        return uuid.UUID(str(value)).int
+    except ValueError:
+        return uuid.uuid5(uuid.NAMESPACE_OID, str(value)).int
+
+
+class Task:
+    __slots__ = ("id", "text", "done", "created", "category_code", "priority_code")
+
+    def __init__(self, text: str, category: str = "General", priority: str = "Medium",
+                 done: bool = False, created: int = None, id: int = None):
+        self.id = uuid.uuid4().int if id is None else id      # 128-bit int instead of a 36-char string
+        self.text = text
+        self.done = done
+        self.created = int(datetime.now().timestamp()) if created is None else created  # epoch seconds
+        self.category_code = name_code(CATEGORY_NAMES, category)
+        self.priority_code = name_code(PRIORITY_NAMES, priority)
+
+    @property
+    def category(self) -> str:
+        return CATEGORY_NAMES[self.category_code]
+
+    @category.setter
+    def category(self, name: str):
+        self.category_code = name_code(CATEGORY_NAMES, name)
+
+    @property
+    def priority(self) -> str:
+        return PRIORITY_NAMES[self.priority_code]
+
+    @priority.setter
+    def priority(self, name: str):
+        self.priority_code = name_code(PRIORITY_NAMES, name)
+
+    @property
+    def id_text(self) -> str:
+        return str(uuid.UUID(int=self.id))
+
+    @property
+    def created_text(self) -> str:
+        return datetime.fromtimestamp(self.created).strftime(CREATED_FORMAT)
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Task":
+        """Build a task from the JSON/dict form, filling defaults for missing fields."""
+        created = None
+        if d.get("created"):
+            try:
+                created = int(datetime.strptime(d["created"], CREATED_FORMAT).timestamp())
+            except ValueError:
+                pass
+        return cls(text=d.get("text", ""), category=d.get("category", "General"),
+                   priority=d.get("priority", "Medium"), done=bool(d.get("done", False)),
+                   created=created, id=parse_task_id(d["id"]) if "id" in d else None)
+
+    def to_dict(self) -> dict:
+        return task_row_dict(TASK_SLOTS(self))
+
+
+# Raw slot values of a task, in __slots__ order; cheap enough to copy every task on the Tk thread
+TASK_SLOTS = attrgetter(*Task.__slots__)
+
+
+def task_row_dict(row) -> dict:
+    """JSON/dict form of a TASK_SLOTS tuple (formatting the uuid and date is the slow part)."""
+    tid, text, done, created, category_code, priority_code = row
+    return {"id": str(uuid.UUID(int=tid)), "text": text, "done": done,
+            "created": datetime.fromtimestamp(created).strftime(CREATED_FORMAT),
+            "priority": PRIORITY_NAMES[priority_code], "category": CATEGORY_NAMES[category_code]}
+
+
+def iter_task_file(path: str):
+    """Tasks from a tasks.json array, normalized one at a time as they are read."""
+    with open(path, "r", encoding="utf-8") as f:
+        for d in JsonStreamReader(f).iter_array():
+            yield Task.from_dict(d)
+
+
+# -----------------------------
+# Background loading
+# -----------------------------
+class BackgroundReader:
+    """Drains an iterator on a worker thread, handing back lists of items.
+
+    The first batch is small so the first screenful shows quickly."""
+
+    def __init__(self, source, first_batch: int = LOAD_FIRST_BATCH, batch: int = LOAD_BATCH):
+        self.batches = queue.Queue()
+        self.done = False
+        self.thread = threading.Thread(target=self.run, args=(source, first_batch, batch),
+                                       name="loader", daemon=True)
+        self.thread.start()
+
+    def run(self, source, first_batch, batch):
+        size = first_batch
+        try:
+            while True:
+                items = list(islice(source, size))
+                self.batches.put(items)
+                if len(items) < size:
+                    break
+                size = batch
+        except Exception as e:
+            self.batches.put(e)
+        self.batches.put(None)
+
+    def take(self, block: bool = False):
+        """Next batch; [] if none is ready yet, None once the source is exhausted."""
+        if self.done:
+            return None
+        try:
+            item = self.batches.get(block)
+        except queue.Empty:
+            return []
+        if item is None or isinstance(item, Exception):
+            self.done = True
+            if item is not None:
+                raise item
+        return item
+
+
+# -----------------------------
+# SQLite task store (one row per task, changes written in batches)
+# -----------------------------
+class TaskDB:
+    COLUMNS = ("id", "text", "done", "created", "priority", "category")
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    done INTEGER NOT NULL DEFAULT 0,
+                    created TEXT NOT NULL,
+                    priority TEXT NOT NULL,
+                    category TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_tasks_done ON tasks (done);
+                CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks (category);
+                CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority);
+                CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks (created);
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            """)
+
+    def load_all(self):
+        return list(self.iter_all())
+
+    def last_rowid(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM tasks").fetchone()[0]
+
+    def iter_all(self, page_size: int = 5000, last_rowid: int = None):
+        """Tasks in insertion (rowid) order, fetched page by page.
+
+        Rows added after last_rowid (default: the scan start) are skipped: the caller already holds them."""
+        if last_rowid is None:
+            last_rowid = self.last_rowid()
+        after = 0
+        while True:
+            rows = self.conn.execute(
+                f"SELECT rowid, {', '.join(self.COLUMNS)} FROM tasks "
+                "WHERE rowid > ? AND rowid <= ? ORDER BY rowid LIMIT ?",
+                (after, last_rowid, page_size)).fetchall()
+            if not rows:
+                return
+            for r in rows:
+                yield Task.from_dict({"id": r[1], "text": r[2], "done": bool(r[3]), "created": r[4],
+                                      "priority": r[5], "category": r[6]})
+            after = rows[-1][0]
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def get_meta(self, key: str, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def set_meta(self, key: str, value: str):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self):
+        self.conn.close()
+
+    UPSERT_SQL = """
+        INSERT INTO tasks (id, text, done, created, priority, category)
+        VALUES (:id, :text, :done, :created, :priority, :category)
+        ON CONFLICT(id) DO UPDATE SET
+            text = excluded.text, done = excluded.done, created = excluded.created,
+            priority = excluded.priority, category = excluded.category
+    """
+    DELETE_SQL = "DELETE FROM tasks WHERE id = ?"
+    # Importing never overwrites a task that is already in the table
+    IMPORT_SQL = """
+        INSERT INTO tasks (id, text, done, created, priority, category)
+        VALUES (:id, :text, :done, :created, :priority, :category)
+        ON CONFLICT(id) DO NOTHING
+    """
+
+    def upsert(self, tasks):
+        self.apply_changes(tasks, ())
+
+    def delete(self, ids):
+        self.apply_changes((), ids)
+
+    def apply_changes(self, upserts, deletes):
+        """Write a batch of upserts and deletes in a single transaction."""
+        with self.conn:
+            self.conn.executemany(self.DELETE_SQL, [(str(uuid.UUID(int=tid)),) for tid in deletes])
+            self.conn.executemany(self.UPSERT_SQL, [{**t.to_dict(), "done": int(t.done)} for t in upserts])
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM tasks")
+
+    def import_json(self, path: str):
+        """One-shot import of an existing tasks.json; returns the number of tasks read.
+
+        Runs as one transaction that also sets the json_imported meta key, so a file that
+        fails to parse partway leaves no rows behind and is imported again next time."""
+        count = 0
+        tasks = iter_task_file(path)
+        with self.conn:
+            while True:
+                batch = list(islice(tasks, 5000))
+                if not batch:
+                    break
+                self.conn.executemany(self.IMPORT_SQL, [{**t.to_dict(), "done": int(t.done)} for t in batch])
+                count += len(batch)
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', '1')")
+        return count
+
+
+def iter_task_db(path: str, last_rowid: int):
+    """Tasks from a connection of its own, opened on first use by whichever thread iterates."""
+    db = TaskDB(path)
+    try:
+        yield from db.iter_all(last_rowid=last_rowid)
+    finally:
+        db.close()
+
+
+# -----------------------------
+# Columnar task table (optional, needs NumPy) for vectorized status/category/priority filters
+# -----------------------------
+class TaskColumns:
+    """Parallel NumPy columns over the task list, in list order.
+
+    Deleted rows are tombstoned in `alive` and compacted away once they make
+    up half the table, so appends, updates and deletes stay O(1) amortized."""
+
+    def __init__(self, tasks=()):
+        self.rebuild(tasks)
+
+    def rebuild(self, tasks):
+        tasks = list(tasks)
+        self.size = len(tasks)
+        capacity = max(1024, self.size * 2)
+        self.rows = tasks + [None] * (capacity - self.size)
+        self.pos = {t.id: i for i, t in enumerate(tasks)}
+        self.dead = 0
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.done = np.zeros(capacity, dtype=bool)
+        self.category = np.zeros(capacity, dtype=np.int16)
+        self.priority = np.zeros(capacity, dtype=np.int8)
+        self.created = np.zeros(capacity, dtype=np.int64)
+        self.alive[:self.size] = True
+        self.done[:self.size] = [t.done for t in tasks]
+        self.category[:self.size] = [t.category_code for t in tasks]
+        self.priority[:self.size] = [t.priority_code for t in tasks]
+        self.created[:self.size] = [t.created for t in tasks]
+
+    def grow(self):
+        extra = len(self.rows)
+        self.rows.extend([None] * extra)
+        for name in ("alive", "done", "category", "priority", "created"):
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate([column, np.zeros(extra, dtype=column.dtype)]))
+
+    def write(self, i, t: Task):
+        self.done[i] = t.done
+        self.category[i] = t.category_code
+        self.priority[i] = t.priority_code
+        self.created[i] = t.created
+
+    def append(self, t: Task):
+        if self.size == len(self.rows):
+            self.grow()
+        i = self.size
+        self.rows[i] = t
+        self.pos[t.id] = i
+        self.alive[i] = True
+        self.write(i, t)
+        self.size += 1
+
+    def update(self, t: Task):
+        self.write(self.pos[t.id], t)
+
+    def remove(self, tid: int):
+        i = self.pos.pop(tid, None)
+        if i is None:
+            return
+        self.alive[i] = False
+        self.rows[i] = None
+        self.dead += 1
+        if self.dead * 2 > self.size:
+            self.rebuild(self.rows[j] for j in np.flatnonzero(self.alive[:self.size]))
+
+    def clear(self):
+        self.rebuild(())
+
+    def filter(self, done=None, category_code=None, priority_code=None):
+        """Live tasks matching every given column value, in list order."""
+        n = self.size
+        mask = self.alive[:n].copy()
+        if done is not None:
+            mask &= self.done[:n] == done
+        if category_code is not None:
+            mask &= self.category[:n] == category_code
+        if priority_code is not None:
+            mask &= self.priority[:n] == priority_code
+        rows = self.rows
+        return [rows[i] for i in np.flatnonzero(mask)]
+
+
+# -----------------------------
+# Trigram index for substring search over task text
+# -----------------------------
+class TrigramIndex:
+    """Trigram -> task id postings over the lowered task text.
+
+    add() only queues a task; catch_up() indexes queued tasks a slice at a time, so
+    loading or adding many tasks never stalls the caller for the whole build. Until
+    the queue is empty search() returns None and the caller scans instead."""
+
+    # Above this share of all tasks a candidate set is cheaper to scan than to intersect
+    SCAN_RATIO = 0.05
+
+    def __init__(self):
+        self.postings = {}   # trigram -> set of task ids
+        self.docs = {}       # task id -> (insertion seq, lowered text, task)
+        self.pending = OrderedDict()   # task id -> task added but not indexed yet
+        self.seq = 0
+
+    @staticmethod
+    def trigrams(text: str):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    @property
+    def ready(self) -> bool:
+        return not self.pending
+
+    def add(self, task: Task):
+        self.pending[task.id] = task
+
+    def index(self, task: Task):
+        text = task.text.lower()
+        self.seq += 1
+        self.docs[task.id] = (self.seq, text, task)
+        for gram in self.trigrams(text):
+            self.postings.setdefault(gram, set()).add(task.id)
+
+    def catch_up(self, budget: int) -> bool:
+        """Index up to `budget` queued tasks, oldest first; True once none are left."""
+        pending = self.pending
+        for _ in range(min(budget, len(pending))):
+            self.index(pending.popitem(last=False)[1])
+        return not pending
+
+    def remove(self, tid: int):
+        if self.pending.pop(tid, None) is not None:
+            return
+        doc = self.docs.pop(tid, None)
+        if doc is None:
+            return
+        for gram in self.trigrams(doc[1]):
+            ids = self.postings.get(gram)
+            if ids is not None:
+                ids.discard(tid)
+                if not ids:
+                    del self.postings[gram]
+
+    def update(self, task: Task):
+        """Re-index a task whose text changed, keeping its position."""
+        doc = self.docs.get(task.id)
+        if doc is None:
+            # Still queued: it is indexed with its current text later
+            return
+        self.remove(task.id)
+        text = task.text.lower()
+        self.docs[task.id] = (doc[0], text, task)
+        for gram in self.trigrams(text):
+            self.postings.setdefault(gram, set()).add(task.id)
+
+    def clear(self):
+        self.postings.clear()
+        self.docs.clear()
+        self.pending.clear()
+
+    def rebuild(self, tasks):
+        self.clear()
+        for t in tasks:
+            self.index(t)
+
+    def search(self, query: str):
+        """Tasks whose text contains `query` (already lowered), in insertion order.
+        Returns None when the caller should scan instead: tasks still queued for
+        indexing, queries shorter than a trigram, or trigrams so common that the
+        candidates cover a large share of the tasks."""
+        if self.pending:
+            return None
+        grams = self.trigrams(query)
+        if not grams:
+            return None
+        postings = sorted((self.postings.get(g, set()) for g in grams), key=len)
+        if len(postings[0]) > self.SCAN_RATIO * len(self.docs):
+            return None
+        candidates = postings[0]
+        for ids in postings[1:]:
+            if not candidates:
+                break
+            candidates = candidates & ids
+        docs = self.docs
+        # Trigrams only narrow the candidates; confirm the actual substring
+        hits = [docs[tid] for tid in candidates if query in docs[tid][1]]
+        hits.sort(key=lambda doc: doc[0])
+        return [doc[2] for doc in hits]
+
+
+# -----------------------------
+# Headless task engine
+# -----------------------------
+class TaskStore:
+    """Task list plus everything derived from it, and its persistence.
+
+    `tasks` keeps insertion order and is never filtered in place; the id map, the
+    counters, the NumPy columns and the trigram index are kept in sync by every
+    mutation. Changes are only recorded as dirty and written together by flush()."""
+
+    def __init__(self, backend: str = STORAGE_BACKEND, data_file: str = DATA_FILE, db_file: str = DB_FILE):
+        self.data_file = data_file
+        self.db_file = db_file
+        self.db = TaskDB(db_file) if backend == "sqlite" else None
+
+        self.tasks = []
+        self.tasks_by_id = {}   # id -> task, kept in sync with self.tasks
+        # Live counters, updated at every mutation so stats never need a full pass
+        self.done_count = 0
+        self.category_counts = Counter()
+        self.priority_counts = Counter()
+        self.columns = TaskColumns() if NUMPY_AVAILABLE else None
+        self.text_index = TrigramIndex()
+        self.search_cache = None      # (query, [tasks whose text contains query])
+
+        self.loader = None            # BackgroundReader while tasks are still being read
+        self.load_error = None        # why the last load stopped early, if it did
+        self.writer = BackgroundWriter()
+        # Unsaved changes, written together by flush() (rows only matter for SQLite)
+        self.dirty = False
+        self.dirty_since = 0.0        # time.monotonic() of the first unsaved change
+        self.dirty_upserts = {}       # task id -> Task
+        self.dirty_deletes = set()    # task ids
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def get(self, tid: int):
+        return self.tasks_by_id.get(tid)
+
+    # -----------------------------
+    # Derived state
+    # -----------------------------
+    def index_task(self, t: Task):
+        self.tasks_by_id[t.id] = t
+        self.done_count += t.done
+        self.category_counts[t.category] += 1
+        self.priority_counts[t.priority] += 1
+
+    def unindex_task(self, t: Task):
+        del self.tasks_by_id[t.id]
+        self.done_count -= t.done
+        self.category_counts[t.category] -= 1
+        self.priority_counts[t.priority] -= 1
+
+    def reindex_all(self):
+        self.tasks_by_id = {}
+        self.done_count = 0
+        self.category_counts = Counter()
+        self.priority_counts = Counter()
+        for t in self.tasks:
+            self.index_task(t)
+
+    def attach(self, t: Task):
+        """Append a task to the list and every index (persistence is up to the caller)."""
+        self.tasks.append(t)
+        self.index_task(t)
+        if self.columns is not None:
+            self.columns.append(t)
+        self.text_index.add(t)
+
+    # -----------------------------
+    # Mutations
+    # -----------------------------
+    def add(self, text: str, category: str = "General", priority: str = "Medium") -> Task:
+        task = Task(text, category=category, priority=priority)
+        self.attach(task)
+        self.invalidate_search()
+        self.record_upserts([task])
+        return task
+
+    def edit(self, task: Task, text: str, category: str, priority: str, done: bool):
+        self.unindex_task(task)
+        task.text = text
+        task.category = category
+        task.priority = priority
+        task.done = done
+        self.index_task(task)
+        if self.columns is not None:
+            self.columns.update(task)
+        self.text_index.update(task)
+        self.invalidate_search()
+        self.record_upserts([task])
+
+    def set_done(self, tasks, done: bool):
+        for t in tasks:
+            self.done_count += int(done) - int(t.done)
+            t.done = done
+            if self.columns is not None:
+                self.columns.update(t)
+        self.record_upserts(tasks)
+
+    def toggle(self, t: Task):
+        self.set_done([t], not t.done)
+
+    def delete(self, ids):
+        ids = set(ids)
+        for tid in ids:
+            t = self.tasks_by_id.get(tid)
+            if t:
+                self.unindex_task(t)
+                if self.columns is not None:
+                    self.columns.remove(tid)
+        # One pass over the list, with O(1) set membership per task
+        self.tasks = [t for t in self.tasks if t.id not in ids]
+        self.record_deletes(ids)
+        for tid in ids:
+            self.text_index.remove(tid)
+        self.invalidate_search()
+
+    def clear(self):
+        """Delete every task; with SQLite the table is emptied right away."""
+        self.tasks.clear()
+        self.loader = None
+        self.reindex_all()
+        if self.columns is not None:
+            self.columns.clear()
+        self.text_index.clear()
+        self.invalidate_search()
+        self.dirty_upserts.clear()
+        self.dirty_deletes.clear()
+        if self.db is not None:
+            self.db.clear()
+        else:
+            self.mark_dirty()
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def index_text(self, budget: int = TEXT_INDEX_BATCH) -> bool:
+        """Index the next slice of loaded/added tasks for search; True once all are indexed."""
+        return self.text_index.catch_up(budget)
+
+    def invalidate_search(self):
+        """Drop cached text matches after tasks are added, removed or renamed."""
+        self.search_cache = None
+
+    def match_text(self, search_text: str):
+        if not search_text:
+            return self.tasks
+        matches = self.text_index.search(search_text)
+        if matches is not None:
+            self.search_cache = (search_text, matches)
+            return matches
+        if self.search_cache is not None and search_text.startswith(self.search_cache[0]):
+            # Query got longer: only the previous matches can still match
+            source = self.search_cache[1]
+        else:
+            source = self.tasks
+        matches = [t for t in source if search_text in t.text.lower()]
+        self.search_cache = (search_text, matches)
+        return matches
+
+    def query(self, search_text: str = "", done: bool = None, category: str = None):
+        """Tasks matching every given filter, in list order; search_text must be lowered."""
+        if self.columns is not None and not search_text:
+            # Vectorized path: status/category become boolean masks over the columns
+            return self.columns.filter(
+                done=done, category_code=None if category is None else name_code(CATEGORY_NAMES, category))
+        return [t for t in self.match_text(search_text)
+                if (done is None or t.done == done) and (category is None or t.category == category)]
+
+    def stats(self) -> dict:
+        return {
+            "total": len(self.tasks),
+            "completed": self.done_count,
+            "pending": len(self.tasks) - self.done_count,
+            "categories": {k: v for k, v in self.category_counts.items() if v},
+            "priorities": {k: v for k, v in self.priority_counts.items() if v},
+        }
+
+    # -----------------------------
+    # Persistence
+    # -----------------------------
+    def record_upserts(self, tasks):
+        for t in tasks:
+            self.dirty_deletes.discard(t.id)
+            self.dirty_upserts[t.id] = t
+        self.mark_dirty()
+
+    def record_deletes(self, ids):
+        for tid in ids:
+            self.dirty_upserts.pop(tid, None)
+            self.dirty_deletes.add(tid)
+        self.mark_dirty()
+
+    def mark_dirty(self):
+        if not self.dirty:
+            self.dirty = True
+            self.dirty_since = time.monotonic()
+
+    @property
+    def save_blocked(self) -> bool:
+        """True when tasks.json was only partly read: writing it would drop the rest."""
+        return self.db is None and self.load_error is not None
+
+    def clear_dirty(self):
+        self.dirty_upserts.clear()
+        self.dirty_deletes.clear()
+        self.dirty = False
+
+    def flush(self, force: bool = False, block: bool = False, on_done=None, on_error=None,
+              overwrite: bool = False) -> bool:
+        """Write every change since the last flush in one go; False if the write was deferred.
+
+        SQLite changes go out in one transaction right here (sqlite3.Error propagates) and
+        on_done() is called directly. The JSON file is rewritten from a snapshot on the
+        background writer; on_done() / on_error(exc) run from writer.poll(). While tasks are
+        still loading the JSON write is deferred unless block=True, which finishes the load
+        first (a parse error it hits propagates and nothing is written), so the file is never
+        written from a partial list. If the load failed partway (save_blocked) the JSON write
+        is refused unless overwrite=True, i.e. the user asked to replace the file with what
+        was loaded. force: write even if clean."""
+        if not (self.dirty or force):
+            return True
+        if self.db is not None:
+            self.db.apply_changes(list(self.dirty_upserts.values()), list(self.dirty_deletes))
+            self.clear_dirty()
+            if on_done is not None:
+                on_done()
+            return True
+        if self.loader is not None:
+            if not block:
+                return False
+            self.finish_loading()
+        if self.save_blocked and not overwrite:
+            return False
+        self.clear_dirty()
+
+        def done():
+            # The file now holds exactly the loaded tasks, so autosave is safe again
+            self.load_error = None
+            if on_done is not None:
+                on_done()
+
+        def failed(e):
+            # Keep the changes pending; the next flush retries
+            self.mark_dirty()
+            if on_error is not None:
+                on_error(e)
+
+        # Copy now; serializing and writing happen on the writer thread
+        rows = list(map(TASK_SLOTS, self.tasks))
+        self.writer.submit(
+            self.data_file,
+            lambda f: json.dump([task_row_dict(r) for r in rows], f, ensure_ascii=False, indent=2),
+            on_done=done, on_error=failed)
+        return True
+
+    def open_source(self):
+        """Lazy iterator over the stored tasks; nothing is read until it is first advanced."""
+        if self.db is not None:
+            # First run on SQLite: bring over an existing tasks.json, once. Only the meta
+            # key says whether that happened; an empty table may just mean everything was deleted
+            if self.db.get_meta("json_imported") is None:
+                if os.path.exists(self.data_file):
+                    self.db.import_json(self.data_file)
+                else:
+                    self.db.set_meta("json_imported", "1")
+            return iter_task_db(self.db_file, self.db.last_rowid())
+        if not os.path.exists(self.data_file):
+            return None
+        return iter_task_file(self.data_file)
+
+    def start_loading(self):
+        """Reset to an empty list and start reading the stored tasks on a loader thread."""
+        self.tasks = []
+        self.loader = None
+        self.load_error = None
+        self.reindex_all()
+        if self.columns is not None:
+            self.columns.clear()
+        self.text_index.clear()
+        self.invalidate_search()
+        source = self.open_source()
+        if source is not None:
+            self.loader = BackgroundReader(source)
+
+    def load_batch(self, block: bool = False) -> bool:
+        """Add the next parsed batch, if one is ready; returns whether anything was added."""
+        if self.loader is None:
+            return False
+        try:
+            batch = self.loader.take(block)
+        except Exception as e:
+            # Only part of the file is in memory: keep flush() from writing it back
+            self.loader = None
+            self.load_error = e
+            raise
+        if batch is None:
+            self.loader = None
+            return False
+        for t in batch:
+            self.attach(t)
+        if batch:
+            self.invalidate_search()
+        return bool(batch)
+
+    def finish_loading(self):
+        """Wait for whatever is still pending (e.g. before writing the whole file back)."""
+        while self.loader is not None:
+            self.load_batch(block=True)
+
+    def load(self):
+        """Read every stored task before returning."""
+        self.start_loading()
+        self.finish_loading()
+
+    def close(self):
+        """Write pending changes (not over a partly loaded tasks.json), wait for the writer
+        and release the database."""
+        try:
+            self.flush(block=True)
+        finally:
+            self.writer.wait()
+            if self.db is not None:
+                self.db.close()
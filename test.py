@@ -1,15 +1,15 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime
-import json
-import os
-import uuid
+import sqlite3
+import time
+
+from task_store import (CATEGORIES, DATA_FILE, DB_FILE, PRIORITIES, STORAGE_BACKEND,
+                        Task, TaskStore)
 
 # -----------------------------
 # Constants & Config
 # -----------------------------
 APP_TITLE = "🚀 Advanced Task Manager"
-DATA_FILE = "tasks.json"
 
 GREEN = "#2eab5f"
 RED = "#e9533d"
@@ -18,8 +18,30 @@ PURPLE = "#7e2bd5"
 DARK_BG = "#2c3e50"
 LIGHT_BG = "#f8f9fa"
 
-CATEGORIES = ["General", "Home", "Work", "Study", "Shopping"]
-PRIORITIES = ["Low", "Medium", "High", "Urgent"]
+# Virtualized list: only the rows in the viewport (+ a small buffer) exist in the Treeview
+ROW_HEIGHT = 28
+RENDER_BUFFER = 5
+
+# Search-as-you-type waits for a pause in typing before filtering
+SEARCH_DEBOUNCE_MS = 150
+
+# Streaming load: the store's loader thread parses batches, the Tk thread picks them up
+# every LOAD_POLL_MS; the first screenful is shown right away
+LOAD_POLL_MS = 10
+
+# Saves run on a writer thread; its completion messages are picked up every WRITER_POLL_MS
+WRITER_POLL_MS = 100
+
+# The search index is built a slice at a time every INDEX_POLL_MS while the Tk loop is free;
+# until it has caught up, searches scan the task list
+INDEX_POLL_MS = 10
+
+# Autosave: changes are written together once editing pauses for AUTOSAVE_QUIET_MS, and never
+# later than AUTOSAVE_MAX_DELAY_MS after the first unsaved change. With AUTOSAVE off only the
+# Save button (and closing the window) writes.
+AUTOSAVE = True
+AUTOSAVE_QUIET_MS = 1000
+AUTOSAVE_MAX_DELAY_MS = 5000
 
 # -----------------------------
 # Priority "grey circle" levels (lighter -> darker)
@@ -39,10 +61,27 @@ class AdvancedTodoApp:
         self.root.geometry("860x700")
         self.root.minsize(820, 620)
         self.root.configure(bg=LIGHT_BG)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Main data source (never mutated destructively by filters): tasks, indexes, persistence
+        self.store = TaskStore(STORAGE_BACKEND, DATA_FILE, DB_FILE)
+
+        # Virtualized view: rows currently shown, first visible index, selection by task id
+        self.view_rows = []
+        self.view_offset = 0
+        self.selected_ids = set()
+
+        # Mirror of what the Treeview currently shows, so redraws can be diffed without asking Tk
+        self.rendered = {}            # iid -> values
+        self.rendered_order = []      # iids top to bottom
+        self.rendered_selection = set()
+        self.scroll_pos = None
 
-        # Main data source (never mutated destructively by filters)
-        # {"id": str, "text": str, "done": bool, "created": str, "priority": str, "category": str}
-        self.tasks = []
+        # Pending after() ids: debounced search, writer polling, autosave, search indexing
+        self.search_after = None
+        self.writer_poll = None
+        self.autosave_after = None
+        self.index_after = None
 
         # UI / filter vars
         self.search_var = tk.StringVar()
@@ -70,7 +109,7 @@ class AdvancedTodoApp:
         style.configure("Header.TFrame", background=DARK_BG)
         style.configure("Light.TFrame", background=LIGHT_BG)
         style.configure("TButton", padding=6)
-        style.configure("Treeview", rowheight=28)
+        style.configure("Treeview", rowheight=ROW_HEIGHT)
         style.configure("Treeview.Heading", font=("Arial", 10, "bold"))
 
     # -----------------------------
@@ -94,7 +133,8 @@ class AdvancedTodoApp:
         self.search_entry = tk.Entry(search_frame, textvariable=self.search_var,
                                      font=('Arial', 10), width=25, bd=1, relief='solid')
         self.search_entry.grid(row=0, column=1, padx=5)
-        self.search_entry.bind('<KeyRelease>', self.filter_tasks)
+        # Only fires when the text actually changes (not on arrow keys etc.)
+        self.search_var.trace_add("write", self.on_search_changed)
 
         tk.Label(search_frame, text="Status:",
                  font=('Arial', 10, 'bold'), bg=LIGHT_BG).grid(row=0, column=2, padx=(20, 5))
@@ -161,10 +201,20 @@ class AdvancedTodoApp:
         self.tree.column('Task', width=420, anchor='w')
         self.tree.column('Time', width=150, anchor='center')
 
-        scrollbar = ttk.Scrollbar(list_frame, orient='vertical', command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # The scrollbar drives view_offset; the Treeview itself never holds more than a window of rows
+        self.scrollbar = ttk.Scrollbar(list_frame, orient='vertical', command=self.on_scrollbar)
         self.tree.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
+        self.scrollbar.pack(side='right', fill='y')
+
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", self.on_mousewheel)
+        self.tree.bind("<Button-5>", self.on_mousewheel)
+        self.tree.bind("<Configure>", lambda e: self.draw_window())
+        self.tree.bind("<Button-1>", self.on_tree_click, add="+")
+        self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
+        # The Treeview's own key bindings stop at the edge of the rendered window
+        for key in ("<Up>", "<Down>", "<Prior>", "<Next>", "<Home>", "<End>"):
+            self.tree.bind(key, self.on_tree_key)
 
         self.tree.bind("<Double-1>", self.on_double_click_toggle)
         self.tree.bind("<Button-3>", self.open_context_menu)
@@ -203,27 +253,175 @@ class AdvancedTodoApp:
     # -----------------------------
     # Rendering & Helpers
     # -----------------------------
-    def values_from_task(self, t: dict):
-        status = "✅" if t.get("done") else "⏰"
+    def values_from_task(self, t: Task):
+        status = "✅" if t.done else "⏰"
         # Use grey-circle shades for priority (lighter -> darker)
-        priority_icon = PRIORITY_CIRCLE.get(t.get("priority", "Medium"), PRIORITY_CIRCLE["Medium"])
-        return (status, priority_icon, t.get("category", "General"),
-                t.get("text", ""), t.get("created", ""))
+        priority_icon = PRIORITY_CIRCLE.get(t.priority, PRIORITY_CIRCLE["Medium"])
+        return (status, priority_icon, t.category, t.text, t.created_text)
 
     def render(self, filtered_list=None):
-        self.tree.delete(*self.tree.get_children())
-        rows = filtered_list if filtered_list is not None else self.tasks
-        for t in rows:
-            self.tree.insert('', 'end', iid=t["id"], values=self.values_from_task(t))
+        self.view_rows = filtered_list if filtered_list is not None else self.store.tasks
+        if self.selected_ids:
+            # Rows filtered out of the view can't stay selected
+            self.selected_ids &= {t.id for t in self.view_rows}
+        self.draw_window()
+
+    def visible_row_count(self):
+        height = self.tree.winfo_height()
+        if height <= 1:  # not mapped yet
+            return int(self.tree.cget("height"))
+        return max(1, height // ROW_HEIGHT - 1)  # minus the heading row
+
+    def draw_window(self):
+        total = len(self.view_rows)
+        page = self.visible_row_count()
+        self.view_offset = max(0, min(self.view_offset, total - page))
+        window = self.view_rows[self.view_offset:self.view_offset + page + RENDER_BUFFER]
+        self.reconcile(window)
+
+        pos = (self.view_offset / total, min(1.0, (self.view_offset + page) / total)) if total else (0.0, 1.0)
+        if pos != self.scroll_pos:
+            self.scroll_pos = pos
+            self.scrollbar.set(*pos)
+
+    def reconcile(self, window):
+        """Apply the minimal delete/insert/item/move calls to turn the Treeview into `window`.
+        Task ids are ints; the Treeview iid is their decimal string."""
+        wanted = {t.id for t in window}
+        stale = [tid for tid in self.rendered_order if tid not in wanted]
+        if stale:
+            self.tree.delete(*map(str, stale))
+            for tid in stale:
+                del self.rendered[tid]
+            self.rendered_selection.difference_update(stale)
+            self.rendered_order = [tid for tid in self.rendered_order if tid in wanted]
+
+        order = self.rendered_order
+        for index, t in enumerate(window):
+            tid = t.id
+            values = self.values_from_task(t)
+            if tid not in self.rendered:
+                self.tree.insert('', index, iid=str(tid), values=values)
+                order.insert(index, tid)
+            else:
+                if self.rendered[tid] != values:
+                    self.tree.item(str(tid), values=values)
+                if order[index] != tid:
+                    self.tree.move(str(tid), '', index)
+                    order.remove(tid)
+                    order.insert(index, tid)
+            self.rendered[tid] = values
+
+        selection = wanted & self.selected_ids
+        if selection != self.rendered_selection:
+            self.tree.selection_set([str(tid) for tid in selection])
+            self.rendered_selection = selection
+
+    def scroll_to(self, offset):
+        self.view_offset = offset
+        self.draw_window()
+
+    def on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.view_rows)))
+        elif args[0] == "scroll":
+            step = self.visible_row_count() if args[2] == "pages" else 1
+            self.scroll_to(self.view_offset + int(args[1]) * step)
+
+    def on_mousewheel(self, event):
+        delta = -3 if (event.num == 4 or event.delta > 0) else 3
+        self.scroll_to(self.view_offset + delta)
+        return "break"
+
+    def on_tree_key(self, event):
+        """Move the focus over all of view_rows, scrolling view_offset to keep it on screen.
+        Shift extends the selection; otherwise the focused row becomes the selection."""
+        total = len(self.view_rows)
+        if not total:
+            return "break"
+        page = self.visible_row_count()
+        focus = self.tree.focus()
+        if event.keysym == "Home":
+            index = 0
+        elif event.keysym == "End":
+            index = total - 1
+        elif focus and int(focus) in self.rendered:
+            index = self.view_offset + self.rendered_order.index(int(focus))
+            index += {"Up": -1, "Down": 1, "Prior": -page, "Next": page}[event.keysym]
+        else:
+            index = self.view_offset  # nothing focused yet: start at the top row shown
+        index = max(0, min(index, total - 1))
+
+        if index < self.view_offset:
+            self.view_offset = index
+        elif index >= self.view_offset + page:
+            self.view_offset = index - page + 1
+        tid = self.view_rows[index].id
+        if event.state & 0x0001:
+            self.selected_ids.add(tid)
+        else:
+            self.selected_ids = {tid}
+        self.draw_window()
+        self.tree.focus(str(tid))
+        return "break"
+
+    def on_tree_click(self, event):
+        # A plain click (no Shift/Control) replaces the selection, including rows scrolled out of view
+        if not event.state & 0x0005:
+            self.selected_ids.clear()
+
+    def on_tree_select(self, _event=None):
+        self.rendered_selection = {int(iid) for iid in self.tree.selection()}
+        self.selected_ids = (self.selected_ids - self.rendered.keys()) | self.rendered_selection
 
     def get_selected_task_ids(self):
-        return list(self.tree.selection())
+        return set(self.selected_ids)
 
     def find_task_by_id(self, tid):
-        for t in self.tasks:
-            if t["id"] == tid:
-                return t
-        return None
+        return self.store.get(tid)
+
+    # -----------------------------
+    # Autosave
+    # -----------------------------
+    def schedule_autosave(self):
+        """(Re)arm the autosave timer after a change."""
+        if not AUTOSAVE or not self.store.dirty or self.store.save_blocked:
+            return
+        if self.autosave_after is not None:
+            self.root.after_cancel(self.autosave_after)
+        # Wait for a pause in editing, but not past the max delay since the first unsaved change
+        remaining_ms = AUTOSAVE_MAX_DELAY_MS - (time.monotonic() - self.store.dirty_since) * 1000
+        delay = max(0, min(AUTOSAVE_QUIET_MS, int(remaining_ms)))
+        self.autosave_after = self.root.after(delay, self.flush_changes)
+
+    def flush_changes(self, announce: bool = False, block: bool = False, overwrite: bool = False):
+        """Write every change since the last save in one go.
+
+        announce: confirm with a message (Save button). block: finish a pending load first
+        instead of retrying later. overwrite: the user agreed to replace a tasks.json that
+        failed to load with the tasks that were loaded."""
+        if self.autosave_after is not None:
+            self.root.after_cancel(self.autosave_after)
+            self.autosave_after = None
+        on_done = (lambda: messagebox.showinfo("Saved", "Tasks saved successfully.")) if announce else None
+        try:
+            flushed = self.store.flush(force=announce, block=block, on_done=on_done,
+                                       on_error=self.on_save_failed, overwrite=overwrite)
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Failed to save tasks: {e}")
+            return
+        except Exception as e:
+            # Finishing the load first (block=True) hit a bad tasks.json; nothing was written
+            self.show_load_error(e)
+            flushed = False
+        if not flushed and not self.store.save_blocked:
+            # Still loading: try again later
+            self.autosave_after = self.root.after(AUTOSAVE_QUIET_MS, self.flush_changes)
+        self.poll_writer()
+
+    def on_save_failed(self, e):
+        # The store keeps the changes pending; the next edit or Save retries
+        messagebox.showerror("Error", f"Failed to save tasks: {e}")
 
     # -----------------------------
     # CRUD
@@ -232,16 +430,9 @@ class AdvancedTodoApp:
         text = self.task_text_var.get().strip()
         if not text:
             return
-        created = datetime.now().strftime("%Y-%m-%d %H:%M")
-        task = {
-            "id": str(uuid.uuid4()),
-            "text": text,
-            "done": False,
-            "created": created,
-            "priority": self.priority_var.get(),
-            "category": self.category_var.get()
-        }
-        self.tasks.append(task)
+        self.store.add(text, category=self.category_var.get(), priority=self.priority_var.get())
+        self.schedule_autosave()
+        self.schedule_indexing()
         self.task_text_var.set("")
         self.apply_filters_and_render()
         self.update_stats()
@@ -254,7 +445,7 @@ class AdvancedTodoApp:
         if len(sel) > 1:
             messagebox.showinfo("Edit Task", "Please select only one task to edit.")
             return
-        tid = sel[0]
+        tid = next(iter(sel))
         task = self.find_task_by_id(tid)
         if not task:
             return
@@ -267,28 +458,26 @@ class AdvancedTodoApp:
         pad = {'padx': 10, 'pady': 6}
 
         tk.Label(edit, text="Task:", bg=LIGHT_BG).grid(row=0, column=0, sticky='e', **pad)
-        text_var = tk.StringVar(value=task["text"])
+        text_var = tk.StringVar(value=task.text)
         tk.Entry(edit, textvariable=text_var, width=44).grid(row=0, column=1, **pad)
 
         tk.Label(edit, text="Category:", bg=LIGHT_BG).grid(row=1, column=0, sticky='e', **pad)
-        cat_var = tk.StringVar(value=task["category"])
+        cat_var = tk.StringVar(value=task.category)
         ttk.Combobox(edit, textvariable=cat_var, values=CATEGORIES,
                      state="readonly", width=18).grid(row=1, column=1, sticky='w', **pad)
 
         tk.Label(edit, text="Priority:", bg=LIGHT_BG).grid(row=2, column=0, sticky='e', **pad)
-        pr_var = tk.StringVar(value=task["priority"])
+        pr_var = tk.StringVar(value=task.priority)
         ttk.Combobox(edit, textvariable=pr_var, values=PRIORITIES,
                      state="readonly", width=18).grid(row=2, column=1, sticky='w', **pad)
 
-        done_var = tk.BooleanVar(value=task["done"])
+        done_var = tk.BooleanVar(value=task.done)
         tk.Checkbutton(edit, text="Completed", variable=done_var,
                        bg=LIGHT_BG).grid(row=3, column=1, sticky='w', **pad)
 
         def save_edit():
-            task["text"] = text_var.get().strip()
-            task["category"] = cat_var.get()
-            task["priority"] = pr_var.get()
-            task["done"] = bool(done_var.get())
+            self.store.edit(task, text_var.get().strip(), cat_var.get(), pr_var.get(), bool(done_var.get()))
+            self.schedule_autosave()
             self.apply_filters_and_render()
             self.update_stats()
             edit.destroy()
@@ -303,15 +492,22 @@ class AdvancedTodoApp:
             return
         if not messagebox.askyesno("Confirm", f"Delete {len(sel)} selected task(s)?"):
             return
-        self.tasks = [t for t in self.tasks if t["id"] not in sel]
+        self.store.delete(sel)
+        self.schedule_autosave()
+        self.selected_ids.clear()
         self.apply_filters_and_render()
         self.update_stats()
 
     def clear_all(self):
-        if not self.tasks:
+        if not self.store.tasks:
             return
         if messagebox.askyesno("Confirm", "Delete all tasks?"):
-            self.tasks.clear()
+            self.selected_ids.clear()
+            try:
+                self.store.clear()
+            except sqlite3.Error as e:
+                messagebox.showerror("Error", f"Failed to delete tasks: {e}")
+            self.schedule_autosave()
             self.render()
             self.update_stats()
 
@@ -319,10 +515,8 @@ class AdvancedTodoApp:
         sel = self.get_selected_task_ids()
         if not sel:
             return
-        for tid in sel:
-            t = self.find_task_by_id(tid)
-            if t:
-                t["done"] = True
+        self.store.set_done([t for t in map(self.find_task_by_id, sel) if t], True)
+        self.schedule_autosave()
         self.apply_filters_and_render()
         self.update_stats()
 
@@ -330,16 +524,18 @@ class AdvancedTodoApp:
         item = self.tree.identify_row(self.root.winfo_pointery())
         if not item:
             return
-        t = self.find_task_by_id(item)
+        t = self.find_task_by_id(int(item))
         if not t:
             return
-        t["done"] = not t["done"]
+        self.store.toggle(t)
+        self.schedule_autosave()
         self.apply_filters_and_render()
         self.update_stats()
 
     def open_context_menu(self, event):
         item = self.tree.identify_row(event.y)
         if item and item not in self.tree.selection():
+            self.selected_ids = {int(item)}
             self.tree.selection_set(item)
         menu = tk.Menu(self.root, tearoff=0)
         menu.add_command(label="Mark Done", command=self.mark_done)
@@ -354,76 +550,121 @@ class AdvancedTodoApp:
     def filter_tasks(self, event=None):
         self.apply_filters_and_render()
 
+    def on_search_changed(self, *_args):
+        if self.search_after is not None:
+            self.root.after_cancel(self.search_after)
+        self.search_after = self.root.after(SEARCH_DEBOUNCE_MS, self.run_search)
+
+    def run_search(self):
+        self.search_after = None
+        self.apply_filters_and_render()
+
     def apply_filters_and_render(self):
         search_text = (self.search_var.get() or "").lower()
         status_filter = self.filter_var.get()            # All | Pending | Completed
         category_filter = self.category_filter_var.get() # All | <Cat>
 
-        filtered = []
-        for t in self.tasks:
-            if search_text and search_text not in t["text"].lower():
-                continue
-            status = "Completed" if t.get("done") else "Pending"
-            if status_filter != "All" and status_filter != status:
-                continue
-            if category_filter != "All" and t.get("category", "General") != category_filter:
-                continue
-            filtered.append(t)
-
-        self.render(filtered_list=filtered if (search_text or status_filter != "All" or category_filter != "All")
-                    else None)
+        if not (search_text or status_filter != "All" or category_filter != "All"):
+            self.render()
+            return
+        self.render(filtered_list=self.store.query(
+            search_text,
+            done=None if status_filter == "All" else status_filter == "Completed",
+            category=None if category_filter == "All" else category_filter))
 
     # -----------------------------
     # Stats & Persistence
     # -----------------------------
     def show_stats(self):
-        total = len(self.tasks)
-        completed = sum(1 for t in self.tasks if t.get('done', False))
-        pending = total - completed
-
-        category_stats = {}
-        for t in self.tasks:
-            cat = t.get('category', 'General')
-            category_stats[cat] = category_stats.get(cat, 0) + 1
+        stats = self.store.stats()
+        category_stats = stats["categories"]
+        priority_stats = stats["priorities"]
 
         stats_text = f"📊 Statistics:\n"
-        stats_text += f"✅ Completed: {completed}\n"
-        stats_text += f"⏰ Pending: {pending}\n"
-        stats_text += f"📈 Total: {total}\n"
+        stats_text += f"✅ Completed: {stats['completed']}\n"
+        stats_text += f"⏰ Pending: {stats['pending']}\n"
+        stats_text += f"📈 Total: {stats['total']}\n"
         stats_text += ("📁 Categories: " + ", ".join([f"{k}({v})" for k, v in category_stats.items()])) if category_stats else "📁 Categories: -"
+        stats_text += "\n"
+        stats_text += ("🎯 Priorities: " + ", ".join([f"{k}({v})" for k, v in priority_stats.items()])) if priority_stats else "🎯 Priorities: -"
 
         messagebox.showinfo("Detailed Statistics", stats_text)
 
     def save_tasks(self):
-        try:
-            with open(DATA_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.tasks, f, ensure_ascii=False, indent=2)
-            messagebox.showinfo("Saved", "Tasks saved successfully.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save tasks: {e}")
+        if self.store.save_blocked and not self.confirm_overwrite():
+            return
+        self.flush_changes(announce=True, block=True, overwrite=True)
+
+    def confirm_overwrite(self) -> bool:
+        return messagebox.askyesno(
+            "Confirm",
+            f"{self.store.data_file} could not be fully loaded. Replace it with the {len(self.store)} task(s) "
+            "shown? Tasks that were not loaded will be lost.")
+
+    def poll_writer(self):
+        """Deliver finished saves' messages; keeps polling while writes are in flight."""
+        if self.writer_poll is not None:
+            self.root.after_cancel(self.writer_poll)
+            self.writer_poll = None
+        self.store.writer.poll()
+        if self.store.writer.busy():
+            self.writer_poll = self.root.after(WRITER_POLL_MS, self.poll_writer)
+
+    def on_close(self):
+        # Write pending changes and let queued saves reach the disk before the process exits
+        self.flush_changes(block=True)
+        if self.store.save_blocked and self.store.dirty and self.confirm_overwrite():
+            self.flush_changes(block=True, overwrite=True)
+        self.store.writer.wait()
+        self.root.destroy()
 
     def load_tasks(self):
-        if not os.path.exists(DATA_FILE):
-            return
+        """Parse tasks on the store's loader thread; show the first screenful now and the rest as it arrives."""
         try:
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            normed = []
-            for t in data:
-                t.setdefault("id", str(uuid.uuid4()))
-                t.setdefault("text", "")
-                t.setdefault("done", False)
-                t.setdefault("created", datetime.now().strftime("%Y-%m-%d %H:%M"))
-                t.setdefault("priority", "Medium")
-                t.setdefault("category", "General")
-                normed.append(t)
-            self.tasks = normed
+            self.store.start_loading()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load tasks: {e}")
+            return
+        self.load_batch(block=True)
+        self.schedule_indexing()
+        if self.store.loader is not None:
+            self.root.after(LOAD_POLL_MS, self.load_more)
+
+    def schedule_indexing(self):
+        """Keep indexing new tasks for search in small slices, between other Tk events."""
+        if self.index_after is None and not self.store.text_index.ready:
+            self.index_after = self.root.after(INDEX_POLL_MS, self.index_more)
+
+    def index_more(self):
+        self.index_after = None
+        if not self.store.index_text():
+            self.schedule_indexing()
+
+    def load_batch(self, block: bool = False) -> bool:
+        try:
+            return self.store.load_batch(block)
+        except Exception as e:
+            self.show_load_error(e)
+            return False
+
+    def show_load_error(self, e):
+        message = f"Failed to load tasks: {e}"
+        if self.store.save_blocked:
+            message += (f"\n\nOnly the tasks read before the error are shown. Autosave is off so "
+                        f"{self.store.data_file} is not overwritten; use Save to replace it with these tasks.")
+        messagebox.showerror("Error", message)
+
+    def load_more(self):
+        if self.load_batch():
+            self.apply_filters_and_render()
+            self.update_stats()
+            self.schedule_indexing()
+        if self.store.loader is not None:
+            self.root.after(LOAD_POLL_MS, self.load_more)
 
     def update_stats(self):
-        total = len(self.tasks)
-        completed = sum(1 for t in self.tasks if t.get('done', False))
+        total = len(self.store)
+        completed = self.store.done_count
         pending = total - completed
         self.stats_label.config(text=f"📊 Tasks: {completed} Completed | {pending} Pending | {total} Total")
 
@@ -0,0 +1,866 @@
+"""Wallet ledger engine: transactions, balance, budget, statistics and storage
+
+No GUI imports, so the ledger can be used and benchmarked headless (batch jobs,
+the --import CLI). Failures are returned as (success, message) results or raised;
+the GUI in wallet-2.py decides how to show them.
+"""
+import json
+import os
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+import heapq
+import sqlite3
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+# fileio.py is shared with the task manager one directory up; the entry point
+# (wallet-2.py, or a script of the caller's) puts that directory on sys.path
+from fileio import BackgroundWriter, JsonStreamReader, write_atomic
+
+# Write-ahead journal settings: every change is appended as one compact
+# record, fsync'ed in batches and folded back into the snapshot periodically
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_FSYNC_EVERY = 16
+JOURNAL_COMPACT_EVERY = 500
+
+# "json" (snapshot + journal) or "sqlite"
+STORAGE_BACKEND = "json"
+
+
+def to_cents(amount):
+    """Convert a money amount to integer cents"""
+    return int((Decimal(str(amount)) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents):
+    """Convert integer cents back to a Decimal amount"""
+    return Decimal(cents).scaleb(-2)
+
+
+def migrate_transaction(transaction):
+    """Upgrade a stored transaction to the integer-cents format"""
+    if 'amount_cents' not in transaction:
+        amount = transaction['amount'].replace('$', '').replace('+', '').replace('-', '')
+        transaction['amount_cents'] = to_cents(amount)
+    transaction.pop('amount', None)
+    transaction.pop('raw_amount', None)
+    return transaction
+
+
+class WalletAggregates:
+    """Running totals kept up to date on every add/delete"""
+    
+    def __init__(self):
+        self.income_cents = 0
+        self.expense_cents = 0
+        self.expense_count = 0
+        # category -> [expense cents, expense count]
+        self.by_category = defaultdict(lambda: [0, 0])
+        # "YYYY-MM" -> [income cents, expense cents, transaction count]
+        self.by_month = defaultdict(lambda: [0, 0, 0])
+        # Max-heap of expense amounts with lazy deletion via live counts; an amount has
+        # a key in expense_live exactly while it has an entry in the heap, so an amount
+        # whose count dropped to 0 and came back reuses its stale entry
+        self.expense_heap = []
+        self.expense_live = {}
+    
+    def add(self, transaction):
+        """Account for a newly added transaction"""
+        cents = transaction['amount_cents']
+        month = self.by_month[transaction['date'][:7]]
+        month[2] += 1
+        if transaction['type'] == "Income":
+            self.income_cents += cents
+            month[0] += cents
+        else:
+            self.expense_cents += cents
+            self.expense_count += 1
+            month[1] += cents
+            category = self.by_category[transaction['category']]
+            category[0] += cents
+            category[1] += 1
+            if cents not in self.expense_live:
+                heapq.heappush(self.expense_heap, -cents)
+                self.expense_live[cents] = 0
+            self.expense_live[cents] += 1
+    
+    def remove(self, transaction):
+        """Take a deleted transaction back out of the totals"""
+        cents = transaction['amount_cents']
+        month_key = transaction['date'][:7]
+        month = self.by_month[month_key]
+        month[2] -= 1
+        if transaction['type'] == "Income":
+            self.income_cents -= cents
+            month[0] -= cents
+        else:
+            self.expense_cents -= cents
+            self.expense_count -= 1
+            month[1] -= cents
+            category = self.by_category[transaction['category']]
+            category[0] -= cents
+            category[1] -= 1
+            if category[1] == 0:
+                del self.by_category[transaction['category']]
+            self.expense_live[cents] -= 1
+        if month[2] == 0:
+            del self.by_month[month_key]
+    
+    def largest_expense_cents(self):
+        """Largest live expense, discarding heap entries that were deleted"""
+        while self.expense_heap and self.expense_live[-self.expense_heap[0]] == 0:
+            del self.expense_live[-heapq.heappop(self.expense_heap)]
+        return -self.expense_heap[0] if self.expense_heap else 0
+
+
+def parse_timestamp(date_text):
+    """Parse a stored "%Y-%m-%d %H:%M:%S" date into a POSIX timestamp"""
+    return datetime.fromisoformat(date_text).timestamp()
+
+
+class DateIndex:
+    """Transactions kept sorted by timestamp for bisect range queries"""
+    
+    def __init__(self, transactions=()):
+        # Parallel columns: sorted (timestamp, id) keys and their transactions
+        pairs = sorted((((parse_timestamp(t['date']), t['id']), t) for t in transactions), key=lambda pair: pair[0])
+        self.keys = [key for key, _ in pairs]
+        self.rows = [t for _, t in pairs]
+    
+    def add(self, transaction):
+        """Insert a transaction; new ones are normally appended at the end"""
+        key = (parse_timestamp(transaction['date']), transaction['id'])
+        i = bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.rows.insert(i, transaction)
+    
+    def remove(self, transaction):
+        """Drop a transaction from the index"""
+        key = (parse_timestamp(transaction['date']), transaction['id'])
+        i = bisect_left(self.keys, key)
+        while i < len(self.keys) and self.keys[i] == key:
+            if self.rows[i] is transaction:
+                del self.keys[i]
+                del self.rows[i]
+                return
+            i += 1
+    
+    def between(self, date_from=None, date_to=None):
+        """Transactions dated within [date_from, date_to]"""
+        lo = bisect_left(self.keys, (date_from.timestamp(),)) if date_from else 0
+        hi = bisect_right(self.keys, (date_to.timestamp(), float('inf'))) if date_to else len(self.keys)
+        return self.rows[lo:hi]
+
+
+class FilterIndex:
+    """Posting lists of transaction ids per type and per category"""
+    
+    def __init__(self):
+        self.by_type = defaultdict(set)
+        self.by_category = defaultdict(set)
+    
+    def add(self, transaction):
+        """Post a transaction id under its type and category"""
+        self.by_type[transaction['type']].add(transaction['id'])
+        self.by_category[transaction['category']].add(transaction['id'])
+    
+    def remove(self, transaction):
+        """Drop a transaction id from its posting lists"""
+        self.by_type[transaction['type']].discard(transaction['id'])
+        self.by_category[transaction['category']].discard(transaction['id'])
+
+
+class JsonStorage:
+    """JSON snapshot + write-ahead journal, queried through in-memory indexes"""
+    
+    def __init__(self, data_file, journal=True, writer=None):
+        self.data_file = data_file
+        self.journal = journal
+        self.writer = writer or BackgroundWriter("wallet-writer")
+        self.journal_file = data_file + JOURNAL_SUFFIX
+        self._journal_handle = None
+        # Why the last load failed, if it did; nothing is written while it is set
+        self.load_error = None
+        # Failed background snapshot writes, handed out by poll_background()
+        self.write_errors = []
+        self.reset()
+    
+    def reset(self):
+        """Forget every loaded transaction and go back to an empty wallet"""
+        self._journal_seq = 0
+        self._journal_records = 0
+        self._journal_unsynced = 0
+        # id -> transaction, kept in insertion (= id) order
+        self.by_id = {}
+        self.meta = {'balance': "0.00", 'budget': "0.00", 'next_id': 1}
+        self.aggregates = WalletAggregates()
+        self.date_index = DateIndex()
+        self.filter_index = FilterIndex()
+    
+    @property
+    def save_blocked(self):
+        """True after a failed load: writing now would replace the file with a partial wallet"""
+        return self.load_error is not None
+    
+    def check_writable(self):
+        """Refuse changes while the wallet on disk could not be loaded"""
+        if self.load_error is not None:
+            raise RuntimeError(f"{self.data_file} could not be loaded ({self.load_error}); "
+                               "changes are not saved so the file is not overwritten")
+    
+    def load(self):
+        """Stream the snapshot, replay the journal and build the indexes
+        
+        On failure the storage is left empty and read-only (see save_blocked)
+        and the error propagates.
+        """
+        self.reset()
+        self.load_error = None
+        try:
+            return self.read_all()
+        except Exception as e:
+            # A half-indexed wallet with default meta would hand out used ids
+            self.reset()
+            self.load_error = e
+            raise
+    
+    def read_all(self):
+        """Body of load()"""
+        needs_migration = False
+        if os.path.exists(self.data_file):
+            data = {}
+            duplicates = []
+            with open(self.data_file, 'r') as f:
+                reader = JsonStreamReader(f)
+                for key in reader.iter_keys():
+                    if key != 'transactions':
+                        data[key] = reader.value()
+                        continue
+                    # Migrate and index each transaction as it is parsed
+                    for t in reader.iter_array():
+                        needs_migration = needs_migration or 'amount_cents' not in t
+                        migrate_transaction(t)
+                        if t['id'] in self.by_id:
+                            # Older versions could hand out the same id twice
+                            duplicates.append(t)
+                            continue
+                        self.index_transaction(t)
+            next_id = data.get('next_id', 1)
+            if self.by_id:
+                next_id = max(next_id, max(self.by_id) + 1)
+            for t in duplicates:
+                t['id'] = next_id
+                next_id += 1
+                needs_migration = True
+                self.index_transaction(t)
+            self.meta = {
+                'balance': str(data.get('balance', '0.00')),
+                'budget': str(data.get('budget', '0.00')),
+                'next_id': next_id
+            }
+            self._journal_seq = data.get('journal_seq', 0)
+        
+        self.replay_journal()
+        self.date_index = DateIndex(self.by_id.values())
+        
+        # Persist the integer-cents format once so later loads skip the migration
+        if needs_migration:
+            self.compact()
+        return self.meta
+    
+    def replay_journal(self):
+        """Apply journal records written after the last snapshot"""
+        if not self.journal or not os.path.exists(self.journal_file):
+            return
+        good = 0   # bytes of complete records
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("Unterminated journal record")
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write at the tail from a crash mid-append
+                    break
+                good += len(line)
+                if record['seq'] <= self._journal_seq:
+                    continue
+                self.apply_record(record)
+                self._journal_seq = record['seq']
+                self._journal_records += 1
+        if good < os.path.getsize(self.journal_file):
+            # Cut the torn tail off, or the next append would be glued onto it
+            # and lost on the next replay along with everything after it
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(good)
+                os.fsync(f.fileno())
+    
+    def index_transaction(self, transaction):
+        """Store a loaded transaction and fold it into the totals and posting lists"""
+        self.by_id[transaction['id']] = transaction
+        self.aggregates.add(transaction)
+        self.filter_index.add(transaction)
+    
+    def unindex_transaction(self, trans_id):
+        """Drop a loaded transaction from the store, totals and posting lists"""
+        transaction = self.by_id.pop(trans_id, None)
+        if transaction is not None:
+            self.aggregates.remove(transaction)
+            self.filter_index.remove(transaction)
+    
+    def apply_record(self, record):
+        """Apply a single journal record to the in-memory state (date index is built afterwards)"""
+        op = record['op']
+        if op == 'add':
+            transaction = migrate_transaction(record['transaction'])
+            self.unindex_transaction(transaction['id'])
+            self.index_transaction(transaction)
+            self.meta['next_id'] = max(self.meta['next_id'], transaction['id'] + 1)
+        elif op == 'delete':
+            self.unindex_transaction(record['id'])
+        for key in ('balance', 'budget', 'next_id'):
+            if key in record:
+                self.meta[key] = record[key]
+    
+    def save_data(self):
+        """Queue a full wallet snapshot for the background writer"""
+        if self.save_blocked:
+            return
+        # Transactions are never modified in place, so a shallow copy is a consistent snapshot
+        seq = self._journal_seq
+        data = {
+            'transactions': list(self.by_id.values()),
+            'balance': self.meta['balance'],
+            'budget': self.meta['budget'],
+            'next_id': self.meta['next_id'],
+            'journal_seq': seq,
+            'last_updated': datetime.now().isoformat()
+        }
+        self.writer.submit(
+            self.data_file,
+            lambda f: json.dump(data, f, indent=2),
+            on_done=lambda: self.trim_journal(seq),
+            on_error=self.write_errors.append
+        )
+    
+    def write_record(self, record):
+        """Append one change to the journal, before it is applied in memory
+        
+        If this raises, the caller leaves memory untouched. Without journaling
+        nothing is written here; saved() snapshots the whole wallet instead.
+        """
+        self.check_writable()
+        if not self.journal:
+            return
+        
+        self._journal_seq += 1
+        record['seq'] = self._journal_seq
+        if self._journal_handle is None:
+            self._journal_handle = open(self.journal_file, 'a')
+        self._journal_handle.write(json.dumps(record, separators=(',', ':')) + "\n")
+        self._journal_handle.flush()
+        self._journal_records += 1
+        self._journal_unsynced += 1
+        if self._journal_unsynced >= JOURNAL_FSYNC_EVERY:
+            self.sync_journal()
+    
+    def saved(self):
+        """After a change is applied in memory: snapshot it when not journaling,
+        or fold the journal into a snapshot once it is long enough"""
+        if not self.journal:
+            self.save_data()
+        elif self._journal_records >= JOURNAL_COMPACT_EVERY:
+            self.compact()
+    
+    def sync_journal(self):
+        """Force buffered journal records to disk"""
+        if self._journal_handle is not None and self._journal_unsynced:
+            os.fsync(self._journal_handle.fileno())
+            self._journal_unsynced = 0
+    
+    def compact(self):
+        """Fold the journal into a fresh snapshot; the journal is trimmed once it is written"""
+        self.save_data()
+        self._journal_records = 0
+    
+    def trim_journal(self, seq):
+        """Drop journal records up to seq, now covered by a snapshot on disk"""
+        # The snapshot records journal_seq, so a crash before this rewrite
+        # only leaves records that replay_journal will skip
+        if not os.path.exists(self.journal_file):
+            return
+        if self._journal_handle is not None:
+            self.sync_journal()
+            self._journal_handle.close()
+            self._journal_handle = None
+        newer = []
+        with open(self.journal_file, 'r') as f:
+            # Records appended while the snapshot was being written stay;
+            # unreadable lines are dropped rather than failing the poll loop
+            for line in f:
+                try:
+                    if line.endswith("\n") and json.loads(line)['seq'] > seq:
+                        newer.append(line)
+                except (ValueError, KeyError, TypeError):
+                    continue
+        write_atomic(self.journal_file, lambda f: f.writelines(newer))
+        self._journal_unsynced = 0
+    
+    def poll_background(self):
+        """Run finished background writes' callbacks; returns the errors of failed ones"""
+        self.writer.poll()
+        errors, self.write_errors = self.write_errors, []
+        return errors
+    
+    def close(self):
+        """Wait for background writes, flush pending journal records and release the journal file"""
+        self.writer.wait()
+        if self._journal_handle is not None:
+            self.sync_journal()
+            self._journal_handle.close()
+            self._journal_handle = None
+    
+    def add(self, transaction, meta):
+        """Store a new transaction together with the updated wallet meta"""
+        if transaction['id'] in self.by_id:
+            raise ValueError(f"Transaction id {transaction['id']} already exists")
+        self.write_record({'op': 'add', 'transaction': transaction, **meta})
+        self.by_id[transaction['id']] = transaction
+        self.meta = dict(meta)
+        self.aggregates.add(transaction)
+        self.date_index.add(transaction)
+        self.filter_index.add(transaction)
+        self.saved()
+    
+    def remove(self, transaction, meta):
+        """Delete a stored transaction together with the updated wallet meta"""
+        self.write_record({'op': 'delete', 'id': transaction['id'], **meta})
+        del self.by_id[transaction['id']]
+        self.meta = dict(meta)
+        self.aggregates.remove(transaction)
+        self.date_index.remove(transaction)
+        self.filter_index.remove(transaction)
+        self.saved()
+    
+    def save_meta(self, meta):
+        """Persist balance/budget/next_id changes"""
+        self.write_record({'op': 'meta', **meta})
+        self.meta = dict(meta)
+        self.saved()
+    
+    def get(self, trans_id):
+        """Transaction by id, or None"""
+        return self.by_id.get(trans_id)
+    
+    def count(self):
+        """Number of stored transactions"""
+        return len(self.by_id)
+    
+    def newest_first(self):
+        """All transactions, newest first"""
+        return list(reversed(self.by_id.values()))
+    
+    def search(self, search_type=None, category=None, date_from=None, date_to=None):
+        """Transactions matching every given filter, newest first"""
+        postings = []
+        if search_type:
+            postings.append(self.filter_index.by_type.get(search_type, set()))
+        if category:
+            postings.append(self.filter_index.by_category.get(category, set()))
+        if date_from or date_to:
+            postings.append({t['id'] for t in self.date_index.between(date_from, date_to)})
+        
+        if not postings:
+            return self.newest_first()
+        
+        # Intersect the smallest posting lists first
+        postings.sort(key=len)
+        ids = postings[0]
+        for posting in postings[1:]:
+            if not ids:
+                break
+            ids = ids & posting
+        
+        return [self.by_id[i] for i in sorted(ids, reverse=True)]
+    
+    def totals(self):
+        """(income cents, expense cents, expense count, largest expense cents)"""
+        aggregates = self.aggregates
+        return (aggregates.income_cents, aggregates.expense_cents,
+                aggregates.expense_count, aggregates.largest_expense_cents())
+    
+    def expense_by_category(self):
+        """category -> expense cents"""
+        return {category: cents for category, (cents, _) in self.aggregates.by_category.items()}
+    
+    def monthly(self, months):
+        """"YYYY-MM" -> (income cents, expense cents) for the last N months"""
+        by_month = self.aggregates.by_month
+        return {month: (by_month[month][0], by_month[month][1])
+                for month in sorted(by_month.keys())[-months:]}
+    
+    def month_expense_cents(self, month):
+        """Total expenses in the given "YYYY-MM" month"""
+        bucket = self.aggregates.by_month.get(month)
+        return bucket[1] if bucket else 0
+
+
+class SqliteStorage:
+    """SQLite-backed storage; filters and aggregates run as SQL queries"""
+    
+    COLUMNS = "id, amount_cents, type, category, description, date"
+    
+    # Every change is its own SQL transaction, so a failed load cannot be overwritten
+    save_blocked = False
+    
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self.conn = None
+    
+    def load(self):
+        """Open the database, creating the schema on first use"""
+        self.conn = sqlite3.connect(self.db_file)
+        self.conn.row_factory = sqlite3.Row
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS transactions (
+                    id INTEGER PRIMARY KEY,
+                    amount_cents INTEGER NOT NULL,
+                    type TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    date TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date);
+                CREATE INDEX IF NOT EXISTS idx_transactions_type ON transactions (type, amount_cents);
+                CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions (category);
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            """)
+        meta = {'balance': "0.00", 'budget': "0.00", 'next_id': 1}
+        for row in self.conn.execute("SELECT key, value FROM meta"):
+            meta[row['key']] = row['value']
+        meta['next_id'] = int(meta['next_id'])
+        return meta
+    
+    def write_meta(self, meta):
+        """Upsert wallet meta rows inside the caller's SQL transaction"""
+        self.conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                              [(key, str(value)) for key, value in meta.items()])
+    
+    def add(self, transaction, meta):
+        """Store a new transaction together with the updated wallet meta"""
+        self.add_many([transaction], meta)
+    
+    def add_many(self, transactions, meta):
+        """Bulk insert transactions in a single SQL transaction"""
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO transactions ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                [(t['id'], t['amount_cents'], t['type'], t['category'], t['description'], t['date'])
+                 for t in transactions])
+            self.write_meta(meta)
+    
+    def remove(self, transaction, meta):
+        """Delete a stored transaction together with the updated wallet meta"""
+        with self.conn:
+            self.conn.execute("DELETE FROM transactions WHERE id = ?", (transaction['id'],))
+            self.write_meta(meta)
+    
+    def save_meta(self, meta):
+        """Persist balance/budget/next_id changes"""
+        with self.conn:
+            self.write_meta(meta)
+    
+    def compact(self):
+        """Nothing to fold; every write is already durable"""
+    
+    def poll_background(self):
+        """Writes are synchronous SQL transactions; nothing runs in the background"""
+        return []
+    
+    def close(self):
+        """Close the database connection"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+    
+    def get(self, trans_id):
+        """Transaction by id, or None"""
+        row = self.conn.execute(f"SELECT {self.COLUMNS} FROM transactions WHERE id = ?", (trans_id,)).fetchone()
+        return dict(row) if row else None
+    
+    def count(self):
+        """Number of stored transactions"""
+        return self.conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+    
+    def newest_first(self):
+        """All transactions, newest first"""
+        return self.search()
+    
+    def search(self, search_type=None, category=None, date_from=None, date_to=None):
+        """Transactions matching every given filter, newest first"""
+        clauses, params = [], []
+        if search_type:
+            clauses.append("type = ?")
+            params.append(search_type)
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if date_from:
+            clauses.append("date >= ?")
+            params.append(date_from.strftime("%Y-%m-%d %H:%M:%S"))
+        if date_to:
+            clauses.append("date <= ?")
+            params.append(date_to.strftime("%Y-%m-%d %H:%M:%S"))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(f"SELECT {self.COLUMNS} FROM transactions {where} ORDER BY id DESC", params)
+        return [dict(row) for row in rows]
+    
+    def totals(self):
+        """(income cents, expense cents, expense count, largest expense cents)"""
+        row = self.conn.execute("""
+            SELECT COALESCE(SUM(CASE WHEN type = 'Income' THEN amount_cents END), 0),
+                   COALESCE(SUM(CASE WHEN type = 'Expense' THEN amount_cents END), 0),
+                   COUNT(CASE WHEN type = 'Expense' THEN 1 END)
+            FROM transactions
+        """).fetchone()
+        largest = self.conn.execute(
+            "SELECT COALESCE(MAX(amount_cents), 0) FROM transactions WHERE type = 'Expense'").fetchone()[0]
+        return row[0], row[1], row[2], largest
+    
+    def expense_by_category(self):
+        """category -> expense cents"""
+        rows = self.conn.execute(
+            "SELECT category, SUM(amount_cents) FROM transactions WHERE type = 'Expense' GROUP BY category")
+        return {category: cents for category, cents in rows}
+    
+    def monthly(self, months):
+        """"YYYY-MM" -> (income cents, expense cents) for the last N months"""
+        rows = self.conn.execute("""
+            SELECT substr(date, 1, 7) AS month,
+                   COALESCE(SUM(CASE WHEN type = 'Income' THEN amount_cents END), 0),
+                   COALESCE(SUM(CASE WHEN type = 'Expense' THEN amount_cents END), 0)
+            FROM transactions GROUP BY month ORDER BY month DESC LIMIT ?
+        """, (months,)).fetchall()
+        return {month: (income, expense) for month, income, expense in reversed(rows)}
+    
+    def month_expense_cents(self, month):
+        """Total expenses in the given "YYYY-MM" month"""
+        return self.conn.execute(
+            "SELECT COALESCE(SUM(amount_cents), 0) FROM transactions "
+            "WHERE type = 'Expense' AND date BETWEEN ? AND ?",
+            (f"{month}-01", f"{month}-31 23:59:59")).fetchone()[0]
+
+
+STORAGE_BACKENDS = {"json": JsonStorage, "sqlite": SqliteStorage}
+DEFAULT_DATA_FILES = {"json": "wallet_data_v2.json", "sqlite": "wallet_data_v2.db"}
+
+
+def import_wallet(json_file, db_file):
+    """One-shot import of a JSON wallet (snapshot + journal) into a SQLite database"""
+    source = JsonStorage(json_file)
+    meta = source.load()
+    dest = SqliteStorage(db_file)
+    try:
+        dest.load()
+        if dest.count():
+            raise ValueError(f"{db_file} already contains transactions")
+        transactions = list(source.by_id.values())
+        dest.add_many(transactions, meta)
+        return len(transactions)
+    finally:
+        source.close()
+        dest.close()
+
+
+class PersonalWallet:
+    """Wallet ledger: balance, budget and transactions on top of a storage backend
+    
+    Operations return (success, message) results or raise; nothing here talks to the user.
+    """
+    
+    def __init__(self, data_file=None, journal=True, backend=STORAGE_BACKEND, load=True):
+        self.data_file = data_file or DEFAULT_DATA_FILES[backend]
+        # Snapshots and CSV exports share one writer thread
+        self.writer = BackgroundWriter("wallet-writer")
+        if backend == "sqlite":
+            self.storage = SqliteStorage(self.data_file)
+        else:
+            self.storage = JsonStorage(self.data_file, journal, self.writer)
+        # Monotonic id sequence, persisted so ids are never reused after a delete
+        self.next_id = 1
+        self.balance = Decimal("0.00")
+        self.budget = Decimal("0.00")
+        self.categories = {
+            "income": ["Salary", "Freelance", "Investment", "Bonus", "Other"],
+            "expense": ["Food", "Transport", "Entertainment", "Utilities", "Shopping", "Healthcare", "Bills", "Other"]
+        }
+        if load:
+            self.load_data()
+    
+    def load_data(self):
+        """Load wallet data from the storage backend; errors propagate to the caller"""
+        meta = self.storage.load()
+        self.balance = Decimal(str(meta['balance']))
+        self.budget = Decimal(str(meta['budget']))
+        self.next_id = meta['next_id']
+    
+    def meta(self, **changes):
+        """Wallet-level values persisted alongside the transactions
+        
+        Keyword arguments replace the current values, for a change that is
+        only applied here once the storage has accepted it.
+        """
+        meta = {'balance': self.balance, 'budget': self.budget, 'next_id': self.next_id, **changes}
+        return {'balance': str(meta['balance']), 'budget': str(meta['budget']), 'next_id': meta['next_id']}
+    
+    def compact(self):
+        """Fold pending journal records into the snapshot"""
+        self.storage.compact()
+    
+    def poll_background(self):
+        """Run finished background writes' callbacks; returns the errors of failed snapshot writes"""
+        self.writer.poll()
+        return self.storage.poll_background()
+    
+    def close(self):
+        """Flush pending writes and release the storage"""
+        self.storage.close()
+        self.writer.wait()
+    
+    def add_transaction(self, amount, trans_type, category, description=""):
+        """Add a new transaction"""
+        try:
+            amount_cents = to_cents(amount)
+            amount = from_cents(amount_cents)
+            
+            if amount <= 0:
+                raise ValueError("Amount must be greater than 0")
+            
+            if trans_type == "income":
+                balance = self.balance + amount
+            elif trans_type == "expense":
+                if amount > self.balance:
+                    raise ValueError("Insufficient balance for this expense")
+                balance = self.balance - amount
+            else:
+                raise ValueError("Invalid transaction type")
+            
+            transaction = {
+                'id': self.next_id,
+                'amount_cents': amount_cents,
+                'type': trans_type.capitalize(),
+                'category': category,
+                'description': description if description else "No description",
+                'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            
+            # Memory only changes once the storage has the transaction
+            self.storage.add(transaction, self.meta(balance=balance, next_id=self.next_id + 1))
+            self.balance = balance
+            self.next_id += 1
+            return True, "Transaction added successfully"
+        
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Error: {str(e)}"
+    
+    def get_balance(self):
+        """Get current balance"""
+        return f"${self.balance:.2f}"
+    
+    def format_amount(self, transaction):
+        """Format a transaction amount for display, e.g. +$200.00"""
+        sign = "+" if transaction['type'] == "Income" else "-"
+        return f"{sign}${from_cents(transaction['amount_cents']):.2f}"
+    
+    def get_transactions(self):
+        """Get all transactions"""
+        return self.storage.newest_first()
+    
+    def delete_transaction(self, trans_id):
+        """Delete a transaction by ID"""
+        try:
+            trans = self.storage.get(trans_id)
+            if not trans:
+                return False, "Transaction not found"
+            
+            # Reverse the transaction
+            amount = from_cents(trans['amount_cents'])
+            if trans['type'] == "Income":
+                balance = self.balance - amount
+            else:
+                balance = self.balance + amount
+            
+            self.storage.remove(trans, self.meta(balance=balance))
+            self.balance = balance
+            return True, "Transaction deleted successfully"
+        except Exception as e:
+            return False, str(e)
+    
+    def get_statistics(self):
+        """Calculate financial statistics"""
+        income_cents, expense_cents, expense_count, largest_cents = self.storage.totals()
+        total_income = from_cents(income_cents)
+        total_expenses = from_cents(expense_cents)
+        
+        avg_expense = total_expenses / expense_count if expense_count else Decimal("0.00")
+        
+        largest_expense = from_cents(largest_cents)
+        
+        return {
+            'total_income': total_income,
+            'total_expenses': total_expenses,
+            'net_savings': total_income - total_expenses,
+            'transaction_count': self.storage.count(),
+            'avg_expense': avg_expense,
+            'largest_expense': largest_expense
+        }
+    
+    def get_expense_by_category(self):
+        """Get expenses grouped by category"""
+        return {category: cents / 100 for category, cents in self.storage.expense_by_category().items()}
+    
+    def get_monthly_data(self, months=6):
+        """Get income and expense data for last N months"""
+        return {month: {'income': income / 100, 'expense': expense / 100}
+                for month, (income, expense) in self.storage.monthly(months).items()}
+    
+    def search_transactions(self, search_type=None, category=None, date_from=None, date_to=None):
+        """Search transactions with filters"""
+        return self.storage.search(
+            search_type=search_type if search_type != "All" else None,
+            category=category if category != "All" else None,
+            date_from=date_from,
+            date_to=date_to
+        )
+    
+    def set_budget(self, amount):
+        """Set monthly budget"""
+        try:
+            budget = Decimal(str(amount))
+            self.storage.save_meta(self.meta(budget=budget))
+            self.budget = budget
+            return True, "Budget set successfully"
+        except Exception as e:
+            return False, str(e)
+    
+    def get_budget_status(self):
+        """Get current budget status"""
+        if self.budget == 0:
+            return None
+        
+        # Get current month expenses
+        current_month = datetime.now().strftime("%Y-%m")
+        month_expenses = from_cents(self.storage.month_expense_cents(current_month))
+        
+        remaining = self.budget - month_expenses
+        percentage = (month_expenses / self.budget * 100) if self.budget > 0 else 0
+        
+        return {
+            'budget': self.budget,
+            'spent': month_expenses,
+            'remaining': remaining,
+            'percentage': float(percentage)
+        }
@@ -1,229 +1,149 @@
-import json
-import os
 from datetime import datetime, timedelta
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from decimal import Decimal
-try:
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
-    print("Warning: matplotlib not installed. Charts will not be available.")
-    print("To install: pip install matplotlib")
 import csv
-from collections import defaultdict
+import math
+import os
+import sys
 
-class PersonalWallet:
-    """Main wallet application class"""
-    
-    def __init__(self, data_file="wallet_data_v2.json"):
-        self.data_file = data_file
-        self.transactions = []
-        self.balance = Decimal("0.00")
-        self.budget = Decimal("0.00")
-        self.categories = {
-            "income": ["Salary", "Freelance", "Investment", "Bonus", "Other"],
-            "expense": ["Food", "Transport", "Entertainment", "Utilities", "Shopping", "Healthcare", "Bills", "Other"]
-        }
-        self.load_data()
-    
-    def load_data(self):
-        """Load wallet data from JSON file"""
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as f:
-                    data = json.load(f)
-                    self.transactions = data.get('transactions', [])
-                    self.balance = Decimal(str(data.get('balance', '0.00')))
-                    self.budget = Decimal(str(data.get('budget', '0.00')))
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to load data: {str(e)}")
-        else:
-            self.balance = Decimal("0.00")
-            self.budget = Decimal("0.00")
-            self.transactions = []
-    
-    def save_data(self):
-        """Save wallet data to JSON file"""
-        try:
-            data = {
-                'transactions': self.transactions,
-                'balance': str(self.balance),
-                'budget': str(self.budget),
-                'last_updated': datetime.now().isoformat()
-            }
-            with open(self.data_file, 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save data: {str(e)}")
-    
-    def add_transaction(self, amount, trans_type, category, description=""):
-        """Add a new transaction"""
-        try:
-            amount = Decimal(str(amount))
-            
-            if amount <= 0:
-                raise ValueError("Amount must be greater than 0")
-            
-            if trans_type == "income":
-                self.balance += amount
-            elif trans_type == "expense":
-                if amount > self.balance:
-                    raise ValueError("Insufficient balance for this expense")
-                self.balance -= amount
-            else:
-                raise ValueError("Invalid transaction type")
-            
-            transaction = {
-                'id': len(self.transactions) + 1,
-                'amount': f"+${amount:.2f}" if trans_type == "income" else f"-${amount:.2f}",
-                'raw_amount': float(amount),
-                'type': trans_type.capitalize(),
-                'category': category,
-                'description': description if description else "No description",
-                'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            self.transactions.append(transaction)
-            self.save_data()
-            return True, "Transaction added successfully"
-        
-        except ValueError as e:
-            return False, str(e)
-        except Exception as e:
-            return False, f"Error: {str(e)}"
-    
-    def get_balance(self):
-        """Get current balance"""
-        return f"${self.balance:.2f}"
-    
-    def get_transactions(self):
-        """Get all transactions"""
-        return sorted(self.transactions, key=lambda x: x['id'], reverse=True)
-    
-    def delete_transaction(self, trans_id):
-        """Delete a transaction by ID"""
+# ledger imports fileio.py, which is shared with the task manager one directory up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ledger import PersonalWallet, import_wallet  # noqa: E402
+
+# matplotlib takes longer to import than the rest of the app takes to start, so
+# it is only imported (by load_matplotlib) when the Analytics tab is first shown
+Figure = None
+FigureCanvasTkAgg = None
+MATPLOTLIB_AVAILABLE = None
+
+PIE_COLORS = ['#81c784', '#ffb74d', '#e57373', '#ba68c8', '#64b5f6', '#ffd54f', '#4dd0e1', '#aed581']
+PIE_START_ANGLE = 90
+
+
+def load_matplotlib():
+    """Import matplotlib on first use; returns whether charts are available"""
+    global Figure, FigureCanvasTkAgg, MATPLOTLIB_AVAILABLE
+    if MATPLOTLIB_AVAILABLE is None:
         try:
-            trans = next((t for t in self.transactions if t['id'] == trans_id), None)
-            if not trans:
-                return False, "Transaction not found"
-            
-            # Reverse the transaction
-            amount = Decimal(trans['amount'].replace('$', '').replace('+', '').replace('-', ''))
-            if trans['type'] == "Income":
-                self.balance -= amount
-            else:
-                self.balance += amount
-            
-            self.transactions = [t for t in self.transactions if t['id'] != trans_id]
-            self.save_data()
-            return True, "Transaction deleted successfully"
-        except Exception as e:
-            return False, str(e)
-    
-    def get_statistics(self):
-        """Calculate financial statistics"""
-        total_income = sum(Decimal(t['amount'].replace('$', '').replace('+', '')) 
-                          for t in self.transactions if t['type'] == "Income")
-        total_expenses = sum(Decimal(t['amount'].replace('$', '').replace('-', '')) 
-                            for t in self.transactions if t['type'] == "Expense")
-        
-        expense_transactions = [t for t in self.transactions if t['type'] == "Expense"]
-        avg_expense = total_expenses / len(expense_transactions) if expense_transactions else Decimal("0.00")
-        
-        largest_expense = max((Decimal(t['amount'].replace('$', '').replace('-', '')) 
-                              for t in expense_transactions), default=Decimal("0.00"))
-        
-        return {
-            'total_income': total_income,
-            'total_expenses': total_expenses,
-            'net_savings': total_income - total_expenses,
-            'transaction_count': len(self.transactions),
-            'avg_expense': avg_expense,
-            'largest_expense': largest_expense
-        }
-    
-    def get_expense_by_category(self):
-        """Get expenses grouped by category"""
-        expenses = defaultdict(float)
-        for t in self.transactions:
-            if t['type'] == "Expense":
-                amount = float(t['amount'].replace('$', '').replace('-', ''))
-                expenses[t['category']] += amount
-        return dict(expenses)
-    
-    def get_monthly_data(self, months=6):
-        """Get income and expense data for last N months"""
-        monthly_data = defaultdict(lambda: {'income': 0, 'expense': 0})
-        
-        for t in self.transactions:
-            trans_date = datetime.strptime(t['date'], "%Y-%m-%d %H:%M:%S")
-            month_key = trans_date.strftime("%Y-%m")
-            amount = abs(float(t['amount'].replace('$', '').replace('+', '').replace('-', '')))
-            
-            if t['type'] == "Income":
-                monthly_data[month_key]['income'] += amount
-            else:
-                monthly_data[month_key]['expense'] += amount
-        
-        # Get last N months
-        sorted_months = sorted(monthly_data.keys())[-months:]
-        return {month: monthly_data[month] for month in sorted_months}
-    
-    def search_transactions(self, search_type=None, category=None, date_from=None, date_to=None):
-        """Search transactions with filters"""
-        results = self.transactions
-        
-        if search_type and search_type != "All":
-            results = [t for t in results if t['type'] == search_type]
-        
-        if category and category != "All":
-            results = [t for t in results if t['category'] == category]
-        
-        if date_from:
-            results = [t for t in results 
-                      if datetime.strptime(t['date'], "%Y-%m-%d %H:%M:%S") >= date_from]
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            MATPLOTLIB_AVAILABLE = True
+        except ImportError:
+            MATPLOTLIB_AVAILABLE = False
+            print("Warning: matplotlib not installed. Charts will not be available.")
+            print("To install: pip install matplotlib")
+    return MATPLOTLIB_AVAILABLE
+
+# Snapshots and exports are written on a background thread; the GUI picks up
+# their completion messages every WRITER_POLL_MS
+WRITER_POLL_MS = 200
+
+
+class ExpenseCharts:
+    """Expense pie and income/expense bars drawn on one long-lived figure
+    
+    When the categories (or months) are the same as last time, the existing
+    wedges and bars are resized in place; otherwise only that axes is redrawn.
+    tight_layout is only recomputed when the labels may have changed size,
+    since it costs about as much as drawing the figure. The caller owns the
+    canvas and redraws it after update().
+    """
+    
+    def __init__(self, figure):
+        self.figure = figure
+        self.figure.patch.set_facecolor('white')
+        self.pie_ax, self.bar_ax = figure.subplots(1, 2)
+        # Categories/months the current artists were drawn for
+        self.pie_key = None
+        self.bar_key = None
+        self.ytick_width = None
+        self.relayout = True
+    
+    def update(self, expense_data, monthly_data):
+        """Show new category totals and monthly income/expense"""
+        self.update_pie(expense_data)
+        self.update_bars(monthly_data)
+        if self.relayout:
+            self.figure.tight_layout()
+            self.relayout = False
+    
+    def update_pie(self, expense_data):
+        """Pie Chart - Expense Distribution by Category"""
+        ax = self.pie_ax
+        total = sum(expense_data.values())
+        key = tuple(expense_data) if total > 0 else ()
+        if key and key == self.pie_key:
+            # Same as what Axes.pie does, applied to the existing artists
+            theta = PIE_START_ANGLE
+            for wedge, label, pct, value in zip(self.wedges, self.labels, self.pcts, expense_data.values()):
+                frac = value / total
+                wedge.set_theta1(theta)
+                theta += 360 * frac
+                wedge.set_theta2(theta)
+                mid = math.radians((wedge.theta1 + wedge.theta2) / 2)
+                x, y = math.cos(mid), math.sin(mid)
+                label.set_position((1.1 * x, 1.1 * y))
+                label.set_horizontalalignment('left' if x > 0 else 'right')
+                pct.set_position((0.6 * x, 0.6 * y))
+                pct.set_text(f'{frac * 100:.1f}%')
+            return
         
-        if date_to:
-            results = [t for t in results 
-                      if datetime.strptime(t['date'], "%Y-%m-%d %H:%M:%S") <= date_to]
+        ax.clear()
+        self.pie_key = key
+        self.relayout = True
+        if key:
+            self.wedges, self.labels, self.pcts = ax.pie(
+                expense_data.values(), labels=expense_data.keys(), autopct='%1.1f%%',
+                startangle=PIE_START_ANGLE, colors=PIE_COLORS[:len(expense_data)])
+        else:
+            ax.text(0.5, 0.5, 'No expense data', ha='center', va='center', transform=ax.transAxes)
+        ax.set_title('Expense Distribution by Category', fontsize=12, fontweight='bold')
+    
+    def update_bars(self, monthly_data):
+        """Bar Graph - Income vs Expense (Last 6 Months)"""
+        ax = self.bar_ax
+        key = tuple(monthly_data)
+        if key and key == self.bar_key:
+            for bar, month in zip(self.income_bars, key):
+                bar.set_height(monthly_data[month]['income'])
+            for bar, month in zip(self.expense_bars, key):
+                bar.set_height(monthly_data[month]['expense'])
+            ax.relim()
+            ax.autoscale_view()
+            self.check_ytick_width()
+            return
         
-        return sorted(results, key=lambda x: x['id'], reverse=True)
-    
-    def set_budget(self, amount):
-        """Set monthly budget"""
-        try:
-            self.budget = Decimal(str(amount))
-            self.save_data()
-            return True, "Budget set successfully"
-        except Exception as e:
-            return False, str(e)
-    
-    def get_budget_status(self):
-        """Get current budget status"""
-        if self.budget == 0:
-            return None
-        
-        # Get current month expenses
-        current_month = datetime.now().strftime("%Y-%m")
-        month_expenses = sum(
-            Decimal(t['amount'].replace('$', '').replace('-', ''))
-            for t in self.transactions
-            if t['type'] == "Expense" and t['date'].startswith(current_month)
-        )
-        
-        remaining = self.budget - month_expenses
-        percentage = (month_expenses / self.budget * 100) if self.budget > 0 else 0
-        
-        return {
-            'budget': self.budget,
-            'spent': month_expenses,
-            'remaining': remaining,
-            'percentage': float(percentage)
-        }
+        ax.clear()
+        self.bar_key = key
+        self.relayout = True
+        if key:
+            income = [monthly_data[m]['income'] for m in key]
+            expense = [monthly_data[m]['expense'] for m in key]
+            
+            x = range(len(key))
+            width = 0.35
+            
+            self.income_bars = ax.bar([i - width/2 for i in x], income, width, label='Income', color='#4caf50')
+            self.expense_bars = ax.bar([i + width/2 for i in x], expense, width, label='Expense', color='#f44336')
+            
+            ax.set_xlabel('Month', fontweight='bold')
+            ax.set_ylabel('Amount ($)', fontweight='bold')
+            ax.set_xticks(x)
+            ax.set_xticklabels(key, rotation=45, ha='right')
+            ax.legend()
+            ax.grid(axis='y', alpha=0.3)
+        else:
+            ax.text(0.5, 0.5, 'No monthly data', ha='center', va='center', transform=ax.transAxes)
+        ax.set_title('Income vs Expense (Last 6 Months)', fontsize=12, fontweight='bold')
+        self.check_ytick_width()
+    
+    def check_ytick_width(self):
+        """Relayout when the largest y tick label gains or loses a digit"""
+        width = len(f"{self.bar_ax.get_ylim()[1]:.0f}")
+        if width != self.ytick_width:
+            self.ytick_width = width
+            self.relayout = True
 
 
 class WalletGUI:
@@ -235,9 +155,42 @@ class WalletGUI:
         self.root.geometry("1000x750")
         self.root.resizable(True, True)
         
-        self.wallet = PersonalWallet()
+        # Tabs whose contents are out of date. Only the visible tab is redrawn;
+        # the others catch up when they are selected (see refresh_visible)
+        self.stale_tabs = set()
+        self.refresh_pending = None
+        self.charts = None
+        self.charts_canvas = None
+        
+        self.wallet = PersonalWallet(load=False)
+        try:
+            self.wallet.load_data()
+        except Exception as e:
+            message = f"Failed to load data: {str(e)}"
+            if self.wallet.storage.save_blocked:
+                message += "\n\nThe wallet is opened empty and read-only so the file on disk is not overwritten."
+            messagebox.showerror("Error", message)
         self.setup_ui()
         self.refresh_all()
+        
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(WRITER_POLL_MS, self.poll_background)
+    
+    def poll_background(self):
+        """Show messages from finished background saves/exports"""
+        self.show_write_errors()
+        self.root.after(WRITER_POLL_MS, self.poll_background)
+    
+    def show_write_errors(self):
+        """Report snapshot writes that failed in the background"""
+        for e in self.wallet.poll_background():
+            messagebox.showerror("Error", f"Failed to save data: {str(e)}")
+    
+    def on_close(self):
+        """Flush the wallet journal before closing the window"""
+        self.wallet.close()
+        self.show_write_errors()
+        self.root.destroy()
     
     def setup_ui(self):
         """Setup the user interface"""
@@ -255,6 +208,14 @@ class WalletGUI:
         self.notebook.add(self.analytics_tab, text="📈 Analytics")
         self.notebook.add(self.budget_tab, text="💰 Budget")
         self.notebook.add(self.search_tab, text="🔍 Search")
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        
+        # How to redraw each tab that shows wallet data
+        self.tab_refreshers = {
+            str(self.transactions_tab): self.refresh_display,
+            str(self.analytics_tab): self.update_analytics,
+            str(self.budget_tab): self.update_budget_display,
+        }
         
         # Setup each tab
         self.setup_transactions_tab()
@@ -647,7 +608,7 @@ class WalletGUI:
         for trans in self.wallet.get_transactions():
             self.tree.insert("", "end", values=(
                 trans['id'],
-                trans['amount'],
+                self.wallet.format_amount(trans),
                 trans['type'],
                 trans['category'],
                 trans['description'],
@@ -655,10 +616,27 @@ class WalletGUI:
             ))
     
     def refresh_all(self):
-        """Refresh all tabs"""
-        self.refresh_display()
-        self.update_analytics()
-        self.update_budget_display()
+        """Mark all tabs stale after the wallet changed"""
+        self.mark_stale(*self.tab_refreshers)
+    
+    def mark_stale(self, *tabs):
+        """Schedule a redraw of tabs; several calls before the next idle
+        point result in one refresh of the visible tab"""
+        self.stale_tabs.update(tabs)
+        if self.refresh_pending is None:
+            self.refresh_pending = self.root.after_idle(self.refresh_visible)
+    
+    def refresh_visible(self):
+        """Redraw the selected tab if it is stale"""
+        self.refresh_pending = None
+        tab = self.notebook.select()
+        if tab in self.stale_tabs:
+            self.stale_tabs.discard(tab)
+            self.tab_refreshers[tab]()
+    
+    def on_tab_changed(self, event=None):
+        """Bring a tab up to date when it is shown"""
+        self.refresh_visible()
     
     def update_analytics(self):
         """Update analytics tab with charts and statistics"""
@@ -681,11 +659,9 @@ class WalletGUI:
     def update_charts(self):
         """Update pie chart and bar graph"""
         try:
-            # Clear existing charts
-            for widget in self.charts_container.winfo_children():
-                widget.destroy()
-            
-            if not MATPLOTLIB_AVAILABLE:
+            if not load_matplotlib():
+                if self.charts_container.winfo_children():
+                    return
                 # Show message if matplotlib is not installed
                 msg_frame = tk.Frame(self.charts_container, bg='white')
                 msg_frame.pack(fill=tk.BOTH, expand=True)
@@ -699,51 +675,15 @@ class WalletGUI:
                 msg.pack(expand=True)
                 return
             
-            # Create figure with subplots
-            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-            fig.patch.set_facecolor('white')
+            if self.charts is None:
+                # One figure and canvas for the lifetime of the window
+                figure = Figure(figsize=(12, 5))
+                self.charts = ExpenseCharts(figure)
+                self.charts_canvas = FigureCanvasTkAgg(figure, master=self.charts_container)
+                self.charts_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
             
-            # Pie Chart - Expense Distribution by Category
-            expense_data = self.wallet.get_expense_by_category()
-            if expense_data:
-                colors = ['#81c784', '#ffb74d', '#e57373', '#ba68c8', '#64b5f6', '#ffd54f', '#4dd0e1', '#aed581']
-                ax1.pie(expense_data.values(), labels=expense_data.keys(), autopct='%1.1f%%',
-                       startangle=90, colors=colors[:len(expense_data)])
-                ax1.set_title('Expense Distribution by Category', fontsize=12, fontweight='bold')
-            else:
-                ax1.text(0.5, 0.5, 'No expense data', ha='center', va='center', transform=ax1.transAxes)
-                ax1.set_title('Expense Distribution by Category', fontsize=12, fontweight='bold')
-            
-            # Bar Graph - Income vs Expense (Last 6 Months)
-            monthly_data = self.wallet.get_monthly_data(6)
-            if monthly_data:
-                months = list(monthly_data.keys())
-                income = [monthly_data[m]['income'] for m in months]
-                expense = [monthly_data[m]['expense'] for m in months]
-                
-                x = range(len(months))
-                width = 0.35
-                
-                ax2.bar([i - width/2 for i in x], income, width, label='Income', color='#4caf50')
-                ax2.bar([i + width/2 for i in x], expense, width, label='Expense', color='#f44336')
-                
-                ax2.set_xlabel('Month', fontweight='bold')
-                ax2.set_ylabel('Amount ($)', fontweight='bold')
-                ax2.set_title('Income vs Expense (Last 6 Months)', fontsize=12, fontweight='bold')
-                ax2.set_xticks(x)
-                ax2.set_xticklabels(months, rotation=45, ha='right')
-                ax2.legend()
-                ax2.grid(axis='y', alpha=0.3)
-            else:
-                ax2.text(0.5, 0.5, 'No monthly data', ha='center', va='center', transform=ax2.transAxes)
-                ax2.set_title('Income vs Expense (Last 6 Months)', fontsize=12, fontweight='bold')
-            
-            plt.tight_layout()
-            
-            # Embed in tkinter
-            canvas = FigureCanvasTkAgg(fig, master=self.charts_container)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            self.charts.update(self.wallet.get_expense_by_category(), self.wallet.get_monthly_data(6))
+            self.charts_canvas.draw_idle()
             
         except Exception as e:
             print(f"Error updating charts: {str(e)}")
@@ -827,7 +767,7 @@ class WalletGUI:
             for trans in results:
                 self.search_tree.insert("", "end", values=(
                     trans['id'],
-                    trans['amount'],
+                    self.wallet.format_amount(trans),
                     trans['type'],
                     trans['category'],
                     trans['description'],
@@ -841,7 +781,8 @@ class WalletGUI:
     def export_to_csv(self):
         """Export transactions to CSV file"""
         try:
-            if not self.wallet.transactions:
+            transactions = self.wallet.get_transactions()
+            if not transactions:
                 messagebox.showwarning("No Data", "No transactions to export")
                 return
             
@@ -853,24 +794,25 @@ class WalletGUI:
             )
             
             if file_path:
-                with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    
-                    # Write header
-                    writer.writerow(['ID', 'Amount', 'Type', 'Category', 'Description', 'Date'])
-                    
-                    # Write data
-                    for trans in self.wallet.get_transactions():
-                        writer.writerow([
-                            trans['id'],
-                            trans['amount'],
-                            trans['type'],
-                            trans['category'],
-                            trans['description'],
-                            trans['date']
-                        ])
+                # Header + rows are built here; the file is written on the background writer
+                rows = [['ID', 'Amount', 'Type', 'Category', 'Description', 'Date']]
+                for trans in transactions:
+                    rows.append([
+                        trans['id'],
+                        self.wallet.format_amount(trans),
+                        trans['type'],
+                        trans['category'],
+                        trans['description'],
+                        trans['date']
+                    ])
                 
-                messagebox.showinfo("Success", f"Transactions exported to:\n{file_path}")
+                self.wallet.writer.submit(
+                    file_path,
+                    lambda csvfile: csv.writer(csvfile).writerows(rows),
+                    on_done=lambda: messagebox.showinfo("Success", f"Transactions exported to:\n{file_path}"),
+                    on_error=lambda e: messagebox.showerror("Error", f"Failed to export: {str(e)}"),
+                    newline=''
+                )
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export: {str(e)}")
     
@@ -904,6 +846,12 @@ class WalletGUI:
 
 def main():
     """Main entry point"""
+    # python wallet-2.py --import wallet_data_v2.json wallet_data_v2.db
+    if len(sys.argv) == 4 and sys.argv[1] == "--import":
+        count = import_wallet(sys.argv[2], sys.argv[3])
+        print(f"Imported {count} transaction(s) into {sys.argv[3]}")
+        return
+    
     root = tk.Tk()
     app = WalletGUI(root)
     root.mainloop()